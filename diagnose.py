@@ -6,6 +6,8 @@ Diagnostic Tool - Überprüfe ob Thumbnail-Support funktioniert
 import os
 import subprocess
 import sys
+import time
+from collections import Counter, defaultdict
 
 def run_command(cmd, description):
     """Führe Befehl aus und zeige Ergebnis"""
@@ -178,7 +180,461 @@ def diagnose_output():
     
     return True
 
-def main():
+def percentile(values, pct):
+    """Nearest-rank Perzentil einer Werteliste"""
+    if not values:
+        return 0.0
+    import math
+
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+def format_ms(seconds):
+    return f"{seconds * 1000:8.1f} ms"
+
+def probe_thumbnail(url):
+    """Lade ein Thumbnail und miss die Latenz"""
+    from rss_to_strm import net
+
+    start = time.perf_counter()
+    try:
+        with net.urlopen(url, timeout=15) as response:
+            status = response.status
+            size = len(response.read())
+        error = None
+    except Exception as e:
+        status = getattr(e, 'code', None)
+        size = 0
+        error = str(e)
+    return {
+        'url': url,
+        'status': status,
+        'bytes': size,
+        'seconds': time.perf_counter() - start,
+        'error': error,
+    }
+
+def profile_feed(url, sample=20, workers=4):
+    """Profiliere einen echten Feed: Fetch, Parse, Extraktion, Thumbnail-Latenz"""
+    import feedparser
+    from concurrent.futures import ThreadPoolExecutor
+    from urllib.parse import urlsplit
+    from rss_to_strm import feed as rss_feed
+    from rss_to_strm import net
+
+    print("\n" + "="*60)
+    print("⏱️  FEED-PROFIL")
+    print("="*60)
+    print(f"Feed: {url}")
+
+    # 1. Fetch
+    start = time.perf_counter()
+    try:
+        if os.path.exists(url):
+            with open(url, 'rb') as f:
+                body = f.read()
+        else:
+            body = net.fetch_bytes(url)
+    except Exception as e:
+        print(f"❌ Feed konnte nicht geladen werden: {e}")
+        return 1
+    fetch_time = time.perf_counter() - start
+
+    # 2. Parse
+    start = time.perf_counter()
+    parsed = feedparser.parse(body)
+    parse_time = time.perf_counter() - start
+
+    print(f"  Fetch:  {format_ms(fetch_time)}  ({len(body) / 1024:.1f} KB)")
+    print(f"  Parse:  {format_ms(parse_time)}  ({len(parsed.entries)} Einträge)")
+    if not parsed.entries:
+        print("⚠️  Keine Einträge gefunden")
+        return 1
+
+    # 3. Extraktion pro Eintrag
+    url_sources = Counter()
+    thumb_sources = Counter()
+    url_times, meta_times, total_times = [], [], []
+    slowest = []
+    thumbnails = []
+
+    for entry in parsed.entries:
+        title = rss_feed.entry_title(entry)
+        t0 = time.perf_counter()
+        video_url, source = rss_feed.extract_video_url(entry)
+        t1 = time.perf_counter()
+        thumb_url, thumb_source = rss_feed.extract_thumbnail(entry)
+        if video_url:
+            rss_feed.extract_metadata(entry, title, video_url)
+        t2 = time.perf_counter()
+
+        url_sources[source or 'kein_video'] += 1
+        thumb_sources[thumb_source or 'kein_thumbnail'] += 1
+        url_times.append(t1 - t0)
+        meta_times.append(t2 - t1)
+        total_times.append(t2 - t0)
+        slowest.append((t2 - t0, title))
+        if video_url and thumb_url:
+            thumbnails.append(thumb_url)
+
+    print(f"\n📊 Extraktion pro Eintrag (n={len(total_times)})")
+    for label, values in (("URL-Strategien", url_times), ("Metadaten", meta_times), ("Gesamt", total_times)):
+        print(f"  {label:15s} p50 {format_ms(percentile(values, 50))}  "
+              f"p95 {format_ms(percentile(values, 95))}  max {format_ms(max(values))}")
+    print(f"  Summe Extraktion: {format_ms(sum(total_times))}")
+    print("  Langsamste Einträge:")
+    for seconds, title in sorted(slowest, reverse=True)[:3]:
+        print(f"    {format_ms(seconds)}  {title[:50]}")
+
+    print("\n🎯 Video-URL-Strategien (Treffer)")
+    for source, count in url_sources.most_common():
+        print(f"  {source:20s} {count:5d}")
+
+    print("\n🖼️  Thumbnail-Strategien (Treffer)")
+    for source, count in thumb_sources.most_common():
+        print(f"  {source:20s} {count:5d}")
+
+    # 4. Thumbnail-Latenz (Stichprobe)
+    probes = thumbnails[:sample]
+    if not probes:
+        print("\nℹ️  Keine Thumbnails zum Testen")
+        return 0
+
+    print(f"\n🌐 Thumbnail-Latenz (Stichprobe: {len(probes)} von {len(thumbnails)})")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(probe_thumbnail, probes))
+
+    ok = [r['seconds'] for r in results if not r['error']]
+    failed = [r for r in results if r['error']]
+    if ok:
+        print(f"  p50 {format_ms(percentile(ok, 50))}  p90 {format_ms(percentile(ok, 90))}  "
+              f"p99 {format_ms(percentile(ok, 99))}  max {format_ms(max(ok))}")
+    print(f"  Erfolgreich: {len(ok)}  Fehlgeschlagen: {len(failed)}")
+
+    by_host = defaultdict(list)
+    for r in results:
+        by_host[urlsplit(r['url']).netloc].append(r)
+    print("  Pro Host:")
+    for host, host_results in sorted(by_host.items(), key=lambda kv: -percentile([r['seconds'] for r in kv[1]], 50)):
+        errors = sum(1 for r in host_results if r['error'])
+        print(f"    {host:35s} n={len(host_results):3d}  "
+              f"p50 {format_ms(percentile([r['seconds'] for r in host_results], 50))}  Fehler={errors}")
+
+    print("  Proben:")
+    for r in results[:10]:
+        status = r['status'] if r['status'] is not None else '---'
+        marker = '❌' if r['error'] else '✅'
+        print(f"    {marker} {status} {format_ms(r['seconds'])} {r['bytes']:8d} B  {r['url'][:60]}")
+
+    return 0
+
+IMAGE_SIGNATURES = {
+    '.jpg': (b'\xff\xd8\xff',),
+    '.jpeg': (b'\xff\xd8\xff',),
+    '.png': (b'\x89PNG\r\n\x1a\n',),
+    '.gif': (b'GIF87a', b'GIF89a'),
+    '.webp': (b'RIFF',),
+}
+
+def check_image(path, ext):
+    """Prüfe ob eine Bilddatei nicht leer ist und zur Endung passt"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(12)
+    except OSError as e:
+        return f"thumbnail_unreadable: {e}"
+    if not head:
+        return "thumbnail_empty"
+    signatures = IMAGE_SIGNATURES.get(ext, ())
+    if not any(head.startswith(sig) for sig in signatures):
+        return "thumbnail_wrong_type"
+    if ext == '.webp' and head[8:12] != b'WEBP':
+        return "thumbnail_wrong_type"
+    return None
+
+def audit_folder(path):
+    """
+    Prüfe einen Ordner. Gibt (ergebnis, unterordner) zurück; ergebnis ist None
+    wenn der Ordner kein Item-Ordner ist (keine .strm/.nfo Dateien).
+    """
+    import xml.etree.ElementTree as ET
+
+    files = {}
+    subdirs = []
+    with os.scandir(path) as it:
+        for dir_entry in it:
+            if dir_entry.name.startswith('.'):
+                continue
+            if dir_entry.is_dir(follow_symlinks=False):
+                subdirs.append(dir_entry.path)
+            else:
+                files[dir_entry.name] = dir_entry
+
+    stems = defaultdict(dict)
+    for name in files:
+        stem, ext = os.path.splitext(name)
+        stems[stem][ext.lower()] = files[name]
+
+    if not any('.strm' in exts or '.nfo' in exts for exts in stems.values()):
+        return None, subdirs
+
+    issues = []
+    counts = Counter()
+    nfo_stems = {stem for stem, exts in stems.items() if '.nfo' in exts}
+    for stem, exts in sorted(stems.items()):
+        if '.strm' not in exts and '.nfo' not in exts:
+            # Thumbnail-Namen wie "Titel-thumb.jpg" gehören zum Item "Titel"
+            continue
+        if '.nfo' not in exts and ' - ' in stem and stem.rsplit(' - ', 1)[0] in nfo_stems:
+            # Weitere Version ("Titel - 720p.strm") teilt sich die NFO von "Titel"
+            exts = dict(exts, **{'.nfo': None})
+        if '.strm' not in exts:
+            issues.append(f"missing_strm: {stem}")
+        if '.nfo' not in exts:
+            issues.append(f"missing_nfo: {stem}")
+
+        if '.strm' in exts:
+            counts['strm'] += 1
+            try:
+                with open(exts['.strm'].path, encoding='utf-8') as f:
+                    target = f.read().strip()
+                if not target.lower().startswith(('http://', 'https://')):
+                    issues.append(f"strm_no_url: {stem}")
+            except (OSError, UnicodeDecodeError) as e:
+                issues.append(f"strm_unreadable: {stem}: {e}")
+
+        if exts.get('.nfo') is not None:
+            counts['nfo'] += 1
+            try:
+                nfo = ET.parse(exts['.nfo'].path)
+            except (OSError, ET.ParseError) as e:
+                issues.append(f"nfo_invalid: {stem}: {e}")
+            else:
+                # Lokale Thumbnail-Referenz muss neben der NFO existieren
+                thumb = (nfo.findtext('thumb') or '').strip()
+                if thumb and '://' not in thumb and thumb not in files:
+                    issues.append(f"thumb_missing: {stem}: {thumb}")
+
+    for name, dir_entry in sorted(files.items()):
+        ext = os.path.splitext(name)[1].lower()
+        if ext in IMAGE_SIGNATURES:
+            counts['thumbnail'] += 1
+            problem = check_image(dir_entry.path, ext)
+            if problem:
+                issues.append(f"{problem}: {name}")
+
+    return {'path': path, 'issues': issues, 'counts': dict(counts)}, subdirs
+
+def audit_library(library, workers=16):
+    """Parallele Konsistenzprüfung einer Output-Bibliothek (os.scandir + Thread-Pool)"""
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    start = time.perf_counter()
+    report = {
+        'library': os.path.abspath(library),
+        'folders': 0,
+        'ok': 0,
+        'counts': Counter(),
+        'problems': [],
+        'errors': [],
+    }
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(audit_folder, library): library}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    result, subdirs = future.result()
+                except OSError as e:
+                    report['errors'].append({'path': path, 'error': str(e)})
+                    continue
+                for subdir in subdirs:
+                    pending[pool.submit(audit_folder, subdir)] = subdir
+                if result is None:
+                    continue
+                report['folders'] += 1
+                report['counts'].update(result['counts'])
+                if result['issues']:
+                    report['problems'].append({
+                        'path': os.path.relpath(result['path'], library),
+                        'issues': result['issues'],
+                    })
+                else:
+                    report['ok'] += 1
+
+    report['counts'] = dict(report['counts'])
+    report['problems'].sort(key=lambda p: p['path'])
+    report['seconds'] = round(time.perf_counter() - start, 3)
+    return report
+
+def print_audit(report):
+    print("\n" + "="*60)
+    print("🔎 BIBLIOTHEKS-AUDIT")
+    print("="*60)
+    print(f"Bibliothek: {report['library']}")
+    print(f"  Item-Ordner: {report['folders']}  OK: {report['ok']}  Mit Problemen: {len(report['problems'])}")
+    for kind, count in sorted(report['counts'].items()):
+        print(f"  .{kind}: {count}")
+    print(f"  Dauer: {report['seconds']:.2f} s")
+    for problem in report['problems'][:20]:
+        print(f"  ❌ {problem['path']}")
+        for issue in problem['issues']:
+            print(f"       {issue}")
+    if len(report['problems']) > 20:
+        print(f"  ... und {len(report['problems']) - 20} weitere (siehe --json)")
+    for error in report['errors']:
+        print(f"  ⚠️  {error['path']}: {error['error']}")
+
+def run_audit(library, workers=16, as_json=False, report_file=None):
+    import json
+
+    if not os.path.isdir(library):
+        print(f"❌ {library} ist kein Verzeichnis")
+        return 2
+
+    report = audit_library(library, workers=workers)
+    if report_file:
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if as_json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_audit(report)
+    return 1 if report['problems'] or report['errors'] else 0
+
+def synthetic_feed(entries, authors=25):
+    """Erzeuge einen RSS-Feed mit vielen Einträgen (wiederkehrende Autoren/Tags, 600 Zeichen Text)"""
+    text = ("Lorem ipsum dolor sit amet, consetetur sadipscing elitr, sed diam nonumy eirmod tempor. " * 7)[:600]
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>'
+             '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/" '
+             'xmlns:dc="http://purl.org/dc/elements/1.1/"><channel><title>Benchmark</title>']
+    for i in range(entries):
+        parts.append(
+            f'<item><title>Sendung {i}</title>'
+            f'<link>https://cdn.example.com/video/{i}_webxl.mp4</link>'
+            f'<dc:creator>Redaktion {i % authors}</dc:creator>'
+            f'<category>Politik</category><category>Talk {i % 5}</category>'
+            f'<pubDate>Tue, {1 + i % 28:02d} Oct 2025 20:15:00 +0200</pubDate>'
+            f'<description>{text}</description>'
+            f'<media:thumbnail url="https://cdn.example.com/img/{i % authors}.jpg"/></item>')
+    parts.append('</channel></rss>')
+    return ''.join(parts).encode('utf-8')
+
+def _unshared(value):
+    """Kopie eines Strings, wie ihn feedparser pro Eintrag liefert (nicht geteilt)"""
+    return (value + ' ')[:-1] if isinstance(value, str) and value else value
+
+def legacy_items(body):
+    """Bisheriges Verhalten nachgebildet: alle Einträge referenziert, dict pro Item"""
+    import feedparser
+    from rss_to_strm import feed as rss_feed
+
+    parsed = feedparser.parse(body)
+    items = {}
+    for entry in parsed.entries:
+        result = rss_feed.extract_entry(entry)
+        if result:
+            title, item = result
+            metadata = item['metadata'].to_dict()
+            metadata['author'] = _unshared(metadata['author'])
+            metadata['duration'] = _unshared(metadata['duration'])
+            metadata['tags'] = [_unshared(tag) for tag in metadata['tags']]
+            items[title] = {'url': item['url'], 'metadata': metadata}
+    return items
+
+def measure_memory(build):
+    """(Ergebnis, Spitze in Bytes, gehaltener Speicher in Bytes) via tracemalloc"""
+    import gc
+    import tracemalloc
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak, retained
+
+def run_memory_benchmark(entries=10000, feed_file=None):
+    """Speicherbedarf von get_feed: kompakte Records vs. dict pro Eintrag"""
+    import logging
+    from rss_to_strm import get_feed
+
+    logging.disable(logging.INFO)
+
+    print("\n" + "="*60)
+    print("🧠 SPEICHER-BENCHMARK")
+    print("="*60)
+    if feed_file:
+        with open(feed_file, 'rb') as f:
+            body = f.read()
+        print(f"Feed: {feed_file} ({len(body) / 1024 / 1024:.1f} MB)")
+    else:
+        body = synthetic_feed(entries)
+        print(f"Synthetischer Feed: {entries} Einträge ({len(body) / 1024 / 1024:.1f} MB)")
+
+    # Aufwärmen: feedparser-Import und Caches beim ersten Aufruf nicht mitmessen
+    warmup = synthetic_feed(50)
+    legacy_items(warmup)
+    get_feed(warmup)
+
+    results = []
+    for label, build in (("dict pro Eintrag (bisher)", lambda: legacy_items(body)),
+                         ("Records + intern (get_feed)", lambda: get_feed(body))):
+        start = time.perf_counter()
+        items, peak, retained = measure_memory(build)
+        seconds = time.perf_counter() - start
+        results.append((label, len(items), peak, retained, seconds))
+        del items
+
+    mb = 1024 * 1024
+    print(f"\n  {'Variante':30s} {'Items':>7s} {'Spitze':>10s} {'Gehalten':>10s} {'B/Item':>8s} {'Zeit':>8s}")
+    for label, count, peak, retained, seconds in results:
+        print(f"  {label:30s} {count:7d} {peak / mb:8.1f} MB {retained / mb:8.1f} MB "
+              f"{retained // max(count, 1):8d} {seconds:6.1f} s")
+
+    (_, _, old_peak, old_retained, _), (_, _, new_peak, new_retained, _) = results
+    print(f"\n  Spitze:   -{100 * (1 - new_peak / old_peak):.0f} %")
+    print(f"  Gehalten: -{100 * (1 - new_retained / old_retained):.0f} %")
+    return 0
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RSS-2-STRM Diagnose-Tool")
+    commands = parser.add_subparsers(dest='command')
+
+    profile = commands.add_parser('profile', help='Feed profilieren (Fetch, Parse, Strategien, Thumbnail-Latenz)')
+    profile.add_argument('url', help='Feed-URL oder lokale Datei')
+    profile.add_argument('--sample', type=int, default=20, help='Anzahl Thumbnail-Proben (Standard: 20)')
+    profile.add_argument('--workers', type=int, default=4, help='parallele Thumbnail-Proben (Standard: 4)')
+
+    audit = commands.add_parser('audit', help='Output-Bibliothek parallel auf Konsistenz prüfen')
+    audit.add_argument('library', nargs='?', default='output', help='Bibliotheks-Verzeichnis (Standard: output)')
+    audit.add_argument('--workers', type=int, default=16, help='Anzahl Threads (Standard: 16)')
+    audit.add_argument('--json', action='store_true', help='Bericht als JSON ausgeben')
+    audit.add_argument('--report', help='JSON-Bericht zusätzlich in diese Datei schreiben')
+
+    memory = commands.add_parser('memory', help='Speicherbedarf der Item-Records messen (tracemalloc)')
+    memory.add_argument('--entries', type=int, default=10000,
+                        help='Einträge im synthetischen Feed (Standard: 10000)')
+    memory.add_argument('--feed', help='stattdessen diese lokale Feed-Datei verwenden')
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'profile':
+        return profile_feed(args.url, sample=args.sample, workers=args.workers)
+    if args.command == 'audit':
+        return run_audit(args.library, workers=args.workers, as_json=args.json, report_file=args.report)
+    if args.command == 'memory':
+        return run_memory_benchmark(entries=args.entries, feed_file=args.feed)
+
     print("""
 ╔════════════════════════════════════════════════════════════╗
 ║          RSS-2-STRM Thumbnail Support Diagnostics          ║
@@ -0,0 +1,29 @@
+"""
+RSS 2.0 Feed to STRM Converter
+Converts RSS 2.0 feeds (videos, podcasts, media) to STRM playlist files for media players.
+
+Importing the package has no side effects: logging is only configured by
+main(), and heavy dependencies (feedparser, urllib, xml.etree) are imported
+on first use.
+
+Library usage:
+    from rss_to_strm import get_feed, write_strm_files
+    items = get_feed("https://example.com/feed.xml")
+    write_strm_files(items, "./output/")
+"""
+
+from .feed import get_feed, extract_entry, parse_filter_keywords
+from .writer import normalize_filename, create_nfo_xml, write_strm_files
+from .pipeline import run
+from .cli import main
+
+__all__ = [
+    'get_feed',
+    'extract_entry',
+    'parse_filter_keywords',
+    'normalize_filename',
+    'create_nfo_xml',
+    'write_strm_files',
+    'run',
+    'main',
+]
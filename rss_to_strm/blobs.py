@@ -0,0 +1,174 @@
+"""
+Content-addressed thumbnail store.
+
+Many feeds use the same show artwork for every episode. Thumbnails are
+stored once per content hash in a hidden directory of the library and the
+per-item thumbnail is a link to that blob:
+
+    <library>/
+    ├── .blobs/3f/3f2a9c...e1.jpg
+    └── Title 1/Title 1-thumb.jpg  ──(hard link)──►  .blobs/3f/3f2a9c...e1.jpg
+
+Links are tried in this order: hard link, reflink (FICLONE, e.g. btrfs/XFS),
+relative symlink, plain copy. Concurrent requests for the same URL share
+one download, and byte-identical images are caught even when their URLs
+differ.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import threading
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR = '.blobs'
+FICLONE = 0x40049409  # _IOW(0x94, 9, int), Linux
+
+
+def _reflink(source, target):
+    import fcntl
+
+    # 'xb': never truncate an existing file, it may share the blob's inode
+    with open(source, 'rb') as src, open(target, 'xb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.unlink(target)
+            raise
+
+
+def _link_new(source, target):
+    """Create target (which must not exist yet) from source; returns the method used"""
+    try:
+        os.link(source, target)
+        return 'hardlink'
+    except OSError:
+        pass
+    try:
+        _reflink(source, target)
+        return 'reflink'
+    except (OSError, ImportError):
+        pass
+    try:
+        os.symlink(os.path.relpath(source, os.path.dirname(target)), target)
+        return 'symlink'
+    except OSError:
+        pass
+    shutil.copyfile(source, target)
+    return 'copy'
+
+
+def link_file(source, target):
+    """
+    Make target refer to source's content; returns the method used.
+
+    An existing target is replaced by rename, never written to: as a hard
+    link of a blob it shares the blob's inode.
+    """
+    try:
+        if os.path.samefile(source, target):
+            return 'existing'
+    except OSError:
+        pass
+    temp_path = f"{target}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        method = _link_new(source, temp_path)
+        os.replace(temp_path, target)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return method
+
+
+class BlobStore:
+    """Thumbnail blobs of one library, safe to use from the thumbnail thread pool"""
+
+    def __init__(self, library):
+        self.root = os.path.join(library, BLOB_DIR)
+        self.lock = threading.Lock()
+        self.by_url = {}       # url -> blob path (or None if the download failed)
+        self.pending = {}      # url -> Event of the download in flight
+        self.stats = {'downloads': 0, 'stored': 0, 'deduplicated': 0}
+
+    def _blob_path(self, digest, ext):
+        return os.path.join(self.root, digest[:2], digest + ext)
+
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def put_bytes(self, data, ext):
+        """Store data under its hash (once), return the blob path"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest, ext)
+        if os.path.exists(path):
+            self._count('deduplicated')
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique temp name per writer; plain open() keeps umask permissions
+        temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        self._count('stored')
+        return path
+
+    def put_file(self, source, ext):
+        """Store an existing file (e.g. from the previous library), return the blob path"""
+        digest = hashlib.sha256()
+        with open(source, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        path = self._blob_path(digest.hexdigest(), ext)
+        if os.path.exists(path):
+            self._count('deduplicated')
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            os.link(source, path)
+        except FileExistsError:
+            self._count('deduplicated')
+            return path
+        except OSError:
+            shutil.copyfile(source, path)
+        self._count('stored')
+        return path
+
+    def fetch(self, url, ext, download):
+        """
+        Blob for url, calling download(url) -> bytes at most once per URL.
+
+        Concurrent callers for the same URL wait for the first download.
+        Returns None if the download failed.
+        """
+        with self.lock:
+            if url in self.by_url:
+                self.stats['deduplicated'] += 1
+                return self.by_url[url]
+            event = self.pending.get(url)
+            owner = event is None
+            if owner:
+                event = self.pending[url] = threading.Event()
+
+        if not owner:
+            event.wait()
+            with self.lock:
+                self.stats['deduplicated'] += 1
+                return self.by_url.get(url)
+
+        path = None
+        try:
+            self._count('downloads')
+            path = self.put_bytes(download(url), ext)
+            return path
+        finally:
+            with self.lock:
+                self.by_url[url] = path
+                del self.pending[url]
+            event.set()
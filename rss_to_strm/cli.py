@@ -0,0 +1,195 @@
+"""
+Command line entry point.
+
+Usage:
+    python3 -m rss_to_strm [rssurl] [output_library] [filter_keywords]
+    python3 rss-to-strm.py [rssurl] [output_library] [filter_keywords]
+"""
+
+import logging
+import sys
+
+#************************************************************************************************************************
+# Configuration - can be overridden via command line arguments
+RSSURL               = "https://mediathekviewweb.de/feed?query=%3E30%20%23markus%2CLanz%20%23maischberger%20%23caren%2Cmiosga%20%23presseclub%20%23hart%2Caber%2Cfair%20%23maybrit%2Cillner%20%23phoenix%2Crunde%20%23internationaler%2Cfr%C3%BChschoppen&everywhere=true"  #url of the rss feed
+OUTPUT_LIBRARY       = "./output/"      #base path for output library
+FILTER_KEYWORDS      = "Gebärdensprache"               #comma-separated list of keywords to filter out (case-insensitive). Items with matching titles are excluded.
+                                        #example: "Gebärdensprache,Untertitel,Preview"
+#************************************************************************************************************************
+
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='rss-to-strm',
+        description='Convert RSS 2.0 feeds to STRM/NFO files for Jellyfin/Kodi.')
+    parser.add_argument('rssurl', nargs='?', default=None,
+                        help='feed URL or local file (default: built-in mediathek feed)')
+    parser.add_argument('output_library', nargs='?', default=None,
+                        help=f'output directory, or index file with --output-format (default: {OUTPUT_LIBRARY})')
+    parser.add_argument('filter_keywords', nargs='?', default=None,
+                        help=f'comma-separated title keywords to skip (default: {FILTER_KEYWORDS})')
+    parser.add_argument('--rendition-policy', default='first', type=_rendition_policy, metavar='POLICY',
+                        help='pick among several video renditions: first (default), highest, lowest, '
+                             'prefer-hls, prefer-hd or max-bitrate=KBPS')
+    parser.add_argument('--fallback-rendition', action='store_true',
+                        help='also write the next-best rendition as "<title> - <quality>.strm"')
+    parser.add_argument('--check-urls', action='store_true',
+                        help='probe video URLs (HEAD / ranged GET) before writing .strm files')
+    parser.add_argument('--dead-urls', choices=('drop', 'flag'), default='drop',
+                        help='what to do with dead video URLs: drop the item (default) or flag it offline in the NFO')
+    parser.add_argument('--url-cache-ttl', type=int, default=None, metavar='SECONDS',
+                        help='how long probe results are reused (default: 21600 = 6 h)')
+    parser.add_argument('--state-dir', default=None,
+                        help='directory for caches and run state (default: .rss-to-strm next to the output library)')
+    parser.add_argument('--snapshots', type=int, default=5, metavar='N',
+                        help='keep the last N raw feed bodies and skip runs whose body is unchanged '
+                             '(default: 5, 0 disables)')
+    parser.add_argument('--force', action='store_true',
+                        help='process the feed even if it is unchanged since the last successful run')
+    parser.add_argument('--replay', metavar='SNAPSHOT',
+                        help='run against a stored snapshot file (or "latest") without network access')
+    parser.add_argument('--layout', default='flat', type=_layout, metavar='LAYOUT',
+                        help='item folder layout: flat (default), show, date, hashed, alpha or a template '
+                             'such as "{show}/Season {year}/{title}"')
+    parser.add_argument('--output-format', choices=('folders', 'm3u', 'json', 'ndjson'), default='folders',
+                        help='folders: one folder with STRM/NFO/thumbnail per item (default); m3u, json, ndjson: '
+                             'a single playlist/index file, output_library is then the file '
+                             '(or a directory receiving index.m3u8/.json/.ndjson)')
+    parser.add_argument('--lock-mode', choices=('skip', 'wait', 'off'), default='skip',
+                        help='when another run holds the output library: skip this run (default), '
+                             'wait for it, or do not lock at all')
+    parser.add_argument('--lock-timeout', type=float, default=None, metavar='SECONDS',
+                        help='give up waiting for the lock after SECONDS (with --lock-mode wait)')
+    parser.add_argument('--enqueue', metavar='QUEUE_DIR',
+                        help='do not run, add this feed/library as a job to a shared work queue directory')
+    parser.add_argument('--work-queue', metavar='QUEUE_DIR',
+                        help='process jobs from a shared work queue directory until it is empty; '
+                             'several processes or hosts can work on the same queue')
+    parser.add_argument('--websub', action='store_true',
+                        help='keep running and update on WebSub pushes from the feed\'s hub '
+                             '(polls every --poll-interval when the feed has no hub)')
+    parser.add_argument('--websub-hub', metavar='URL', help='use this hub instead of the one the feed announces')
+    parser.add_argument('--websub-callback', metavar='URL',
+                        help='public URL of the callback the hub pushes to (default: http://<hostname>:<port>/websub/<feed>)')
+    parser.add_argument('--websub-listen', default='0.0.0.0:8085', metavar='HOST:PORT',
+                        help='address of the local callback server (default: 0.0.0.0:8085)')
+    parser.add_argument('--websub-secret', metavar='SECRET',
+                        help='hub.secret for push signatures (default: random per start)')
+    parser.add_argument('--websub-payload', choices=('auto', 'full', 'fetch'), default='auto',
+                        help='use pushed content directly (full), only as a trigger to re-fetch the feed (fetch), '
+                             'or decide by its size (auto, default)')
+    parser.add_argument('--poll-interval', type=int, default=3600, metavar='SECONDS',
+                        help='with --websub: polling interval without hub, safety-net poll with hub (default: 3600)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='enable DEBUG logging')
+    return parser
+
+
+def _rendition_policy(value):
+    import argparse
+    from .renditions import parse_policy
+
+    try:
+        parse_policy(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value.strip().lower()
+
+
+def _layout(value):
+    import argparse
+    from .layout import resolve_layout
+
+    try:
+        resolve_layout(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+
+def main(argv=None):
+    """Parse arguments, configure logging and run the converter. Returns an exit code."""
+    args = build_parser().parse_args(argv)
+
+    # Configure logging
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    rssurl = RSSURL
+    output_library = OUTPUT_LIBRARY
+    filter_keywords = FILTER_KEYWORDS
+
+    if args.rssurl is not None:
+        rssurl = args.rssurl
+        logging.info(f"RSS URL override via command line: {rssurl}")
+
+    if args.output_library is not None:
+        output_library = args.output_library
+        logging.info(f"Output library override via command line: {output_library}")
+
+    if args.filter_keywords is not None:
+        filter_keywords = args.filter_keywords
+        logging.info(f"Filter keywords override via command line: {filter_keywords}")
+
+    options = dict(filter_keywords=filter_keywords,
+                   rendition_policy=args.rendition_policy,
+                   fallback_rendition=args.fallback_rendition,
+                   check_urls=args.check_urls,
+                   dead_urls=args.dead_urls,
+                   url_cache_ttl=args.url_cache_ttl,
+                   state_dir=args.state_dir,
+                   snapshots=args.snapshots,
+                   force=args.force,
+                   replay=args.replay,
+                   layout=args.layout,
+                   output_format=args.output_format,
+                   lock=args.lock_mode,
+                   lock_timeout=args.lock_timeout)
+
+    from .pipeline import run
+
+    if args.enqueue:
+        import os
+        from .coordination import WorkQueue
+
+        # Workers may run elsewhere: make local paths independent of this cwd
+        if not rssurl.lower().startswith(('http://', 'https://')) and os.path.exists(rssurl):
+            rssurl = os.path.abspath(rssurl)
+        job = dict(options, rssurl=rssurl, output_library=os.path.abspath(output_library))
+        if job['state_dir']:
+            job['state_dir'] = os.path.abspath(job['state_dir'])
+        if job['replay'] and job['replay'] != 'latest':
+            job['replay'] = os.path.abspath(job['replay'])
+        name = WorkQueue(args.enqueue).enqueue(job)
+        logging.info(f"Queued job {name} in {args.enqueue}")
+        return 0
+
+    if args.work_queue:
+        from .coordination import WorkQueue
+
+        def process(job):
+            job = dict(options, **job)
+            return run(job.pop('rssurl'), job.pop('output_library'), **job)
+
+        done, failed, skipped = WorkQueue(args.work_queue).work(process)
+        logging.info(f"Work queue empty - {done} jobs done, {failed} failed, "
+                     f"{skipped} skipped (library busy, left in the queue)")
+        return 0 if not failed else 1
+
+    if args.websub:
+        from .websub import serve
+        return serve(rssurl, output_library, options,
+                     hub=args.websub_hub,
+                     callback_url=args.websub_callback,
+                     listen=args.websub_listen,
+                     secret=args.websub_secret,
+                     poll_interval=args.poll_interval,
+                     payload=args.websub_payload)
+
+    ok = run(rssurl, output_library, **options)
+    return 1 if ok is False else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
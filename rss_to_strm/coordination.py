@@ -0,0 +1,293 @@
+"""
+Run coordination across processes and hosts.
+
+Library lock:
+    Every run holds an advisory lock on its output library, so overlapping
+    cron runs cannot both rmtree/move the same directory. The lock is a
+    file created with O_CREAT|O_EXCL (atomic on local filesystems and on
+    NFSv3+/SMB shares) in the hidden state directory next to the library:
+
+        <parent>/.rss-to-strm/locks/<library name>-<hash>.lock
+            {"pid": 1234, "host": "nas", "since": 1760000000.0}
+
+    The holder refreshes the file's mtime while it runs. A lock is stale
+    when its process is gone (same host) or it has not been refreshed for
+    STALE_AFTER seconds (any host); a stale lock is taken over by renaming
+    it away, which only one contender can win. A second run either skips
+    (default) or waits for the lock.
+
+Work queue:
+    Several processes or hosts sharing a directory can split many feeds
+    between them. Each job is a JSON file with run() arguments:
+
+        <queue>/pending/<job>.json   waiting
+        <queue>/claimed/<job>.json@<host>-<pid>   being processed
+        <queue>/done/<job>.json, <queue>/failed/<job>.json
+
+    A worker claims a job by renaming it from pending/ into claimed/; the
+    rename succeeds for exactly one worker. Claims whose owner stopped
+    refreshing them, and jobs whose library was locked by another run, are
+    put back into pending/.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+from .state import default_state_dir, ensure_dir
+
+logger = logging.getLogger(__name__)
+
+LOCK_MODES = ('skip', 'wait', 'off')
+STALE_AFTER = 600
+HEARTBEAT = 60
+POLL_INTERVAL = 1.0
+
+
+def _owner():
+    return {'pid': os.getpid(), 'host': socket.gethostname(), 'since': time.time()}
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+def is_stale(path, info, stale_after=STALE_AFTER):
+    """True if a lock or claim file's owner is gone or stopped refreshing it"""
+    try:
+        age = time.time() - os.stat(path).st_mtime
+    except FileNotFoundError:
+        return False
+    if age > stale_after:
+        return True
+    if info and info.get('host') == socket.gethostname() and isinstance(info.get('pid'), int):
+        return not _process_alive(info['pid'])
+    return False
+
+
+class _Heartbeat(threading.Thread):
+    """Keeps the mtime of a lock or claim file fresh while work is running"""
+
+    def __init__(self, path, interval=HEARTBEAT):
+        super().__init__(name='rss-to-strm-heartbeat', daemon=True)
+        self.path = path
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                os.utime(self.path)
+            except OSError as e:
+                logger.warning(f"Could not refresh {self.path}: {e}")
+
+    def stop(self):
+        self.stopped.set()
+
+
+def lock_path(output_library):
+    """Lock file of an output library (independent of --state-dir)"""
+    library = os.path.abspath(output_library.rstrip('/\\') or '.')
+    digest = hashlib.sha256(library.encode('utf-8')).hexdigest()[:8]
+    name = f"{os.path.basename(library) or 'root'}-{digest}.lock"
+    return os.path.join(default_state_dir(output_library), 'locks', name)
+
+
+class LibraryLock:
+    """
+    Advisory lock on an output library.
+
+    acquire() returns True once the lock is held, or False when mode is
+    'skip' (or 'wait' ran into timeout) and another run holds it.
+    """
+
+    def __init__(self, output_library, stale_after=STALE_AFTER, heartbeat=HEARTBEAT):
+        self.path = lock_path(output_library)
+        self.stale_after = stale_after
+        self.heartbeat_interval = min(heartbeat, max(stale_after / 3, 0.1))
+        self.heartbeat = None
+
+    def holder(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _try_create(self):
+        ensure_dir(os.path.dirname(self.path))
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(_owner(), f)
+        return True
+
+    def _break_stale(self):
+        """Move a stale lock out of the way; only one contender's rename succeeds"""
+        holder = self.holder()
+        if not is_stale(self.path, holder, self.stale_after):
+            return False
+        broken = f"{self.path}.stale-{os.getpid()}"
+        try:
+            os.rename(self.path, broken)
+        except OSError:
+            return False
+        try:
+            with open(broken, encoding='utf-8') as f:
+                moved = json.load(f)
+        except (OSError, ValueError):
+            moved = None
+        if moved != holder:
+            # Another contender replaced the stale lock in between: put theirs back
+            try:
+                os.link(broken, self.path)
+            except OSError:
+                pass
+            os.unlink(broken)
+            return False
+        os.unlink(broken)
+        logger.warning(f"Removed stale lock of {holder or 'unknown owner'}: {self.path}")
+        return True
+
+    def acquire(self, mode='skip', timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        announced = False
+        while True:
+            if self._try_create() or (self._break_stale() and self._try_create()):
+                self.heartbeat = _Heartbeat(self.path, self.heartbeat_interval)
+                self.heartbeat.start()
+                logger.debug(f"Acquired library lock: {self.path}")
+                return True
+
+            if mode != 'wait' or (deadline is not None and time.monotonic() >= deadline):
+                return False
+            if not announced:
+                logger.info(f"Waiting for the run holding {self.path}: {self.holder()}")
+                announced = True
+            time.sleep(POLL_INTERVAL)
+
+    def release(self):
+        if self.heartbeat:
+            self.heartbeat.stop()
+            self.heartbeat.join()
+            self.heartbeat = None
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class WorkQueue:
+    """Shared directory of run jobs claimed by atomic renames"""
+
+    def __init__(self, directory, stale_after=STALE_AFTER):
+        self.directory = directory
+        self.stale_after = stale_after
+        self.worker = f"{socket.gethostname()}-{os.getpid()}"
+        for name in ('pending', 'claimed', 'done', 'failed'):
+            ensure_dir(os.path.join(directory, name))
+
+    def _dir(self, name):
+        return os.path.join(self.directory, name)
+
+    def enqueue(self, job):
+        """Add a job (dict of run() keyword arguments), return its file name"""
+        key = hashlib.sha256(json.dumps(job, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{key}.json"
+        temp = os.path.join(self._dir('pending'), '.' + name + '.tmp')
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(temp, os.path.join(self._dir('pending'), name))
+        return name
+
+    def requeue_stale(self):
+        """Return claims of crashed or vanished workers to pending/"""
+        for claim in os.listdir(self._dir('claimed')):
+            path = os.path.join(self._dir('claimed'), claim)
+            job, _, owner = claim.rpartition('@')
+            host, _, pid = owner.rpartition('-')
+            info = {'host': host, 'pid': int(pid)} if pid.isdigit() else None
+            if job and is_stale(path, info, self.stale_after):
+                try:
+                    os.rename(path, os.path.join(self._dir('pending'), job))
+                    logger.warning(f"Requeued stale job claimed by {owner}: {claim}")
+                except OSError:
+                    pass
+
+    def claim(self, exclude=()):
+        """Claim the oldest pending job not in exclude, return (name, job) or None when there is none"""
+        self.requeue_stale()
+        for name in sorted(os.listdir(self._dir('pending'))):
+            if name.startswith('.') or not name.endswith('.json') or name in exclude:
+                continue
+            claimed = self.claim_path(name)
+            try:
+                os.rename(os.path.join(self._dir('pending'), name), claimed)
+            except OSError:
+                continue  # another worker was faster
+            os.utime(claimed)
+            try:
+                with open(claimed, encoding='utf-8') as f:
+                    return name, json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"Unreadable job {name}: {e}")
+                self.finish(name, False)
+        return None
+
+    def claim_path(self, name):
+        return os.path.join(self._dir('claimed'), f"{name}@{self.worker}")
+
+    def finish(self, name, ok):
+        """Move a claimed job to done/ or failed/, or back to pending/ when ok is None"""
+        target = 'pending' if ok is None else 'done' if ok else 'failed'
+        try:
+            os.rename(self.claim_path(name), os.path.join(self._dir(target), name))
+        except OSError as e:
+            logger.warning(f"Could not finish job {name}: {e}")
+
+    def work(self, process):
+        """
+        Claim and process jobs until pending/ is empty; returns (done, failed, skipped).
+
+        process(job) returns True (done), False (failed) or None when the job
+        was skipped, e.g. because its library is locked by another run;
+        skipped jobs go back to pending/ for a later worker.
+        """
+        done = failed = 0
+        skipped = set()
+        while True:
+            claimed = self.claim(exclude=skipped)
+            if claimed is None:
+                return done, failed, len(skipped)
+            name, job = claimed
+            logger.info(f"Claimed job {name} ({self.worker})")
+            heartbeat = _Heartbeat(self.claim_path(name), min(HEARTBEAT, max(self.stale_after / 3, 0.1)))
+            heartbeat.start()
+            try:
+                ok = process(job)
+            except Exception as e:
+                logger.error(f"Job {name} failed: {e}")
+                ok = False
+            finally:
+                heartbeat.stop()
+                heartbeat.join()
+            self.finish(name, ok)
+            if ok is None:
+                logger.info(f"Job {name} skipped, returned to the queue")
+                skipped.add(name)
+            elif ok:
+                done += 1
+            else:
+                failed += 1
@@ -0,0 +1,81 @@
+"""
+Date normalisation for the NFO <aired> field.
+
+Feeds mix RFC 822 dates (RSS pubDate: "Tue, 14 Oct 2025 20:15:00 +0200")
+and ISO 8601 dates (Atom, <published>2025-10-16T12:00:00Z</published>).
+Both are parsed by a memoized fast path that keeps the calendar date in
+the feed's own timezone, so a show published at 00:30 +0200 does not slip
+to the previous day. Strings neither parser understands fall back to the
+time.struct_time feedparser already computed (published_parsed /
+updated_parsed, normalised to UTC).
+
+Large feeds repeat the same timestamp strings a lot (batch uploads share
+one pubDate), so parse results are cached per string.
+"""
+
+import functools
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DATE_FIELDS = ('published', 'updated', 'created')
+CACHE_SIZE = 8192
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse_date(text):
+    """Return 'YYYY-MM-DD' for an RFC 822 or ISO 8601 string, else None"""
+    if not text:
+        return None
+    text = text.strip()
+
+    # ISO 8601 / RFC 3339 (Atom): starts with a four-digit year
+    if text[:4].isdigit():
+        iso = text[:-1] + '+00:00' if text.endswith(('Z', 'z')) else text
+        try:
+            return datetime.fromisoformat(iso).strftime('%Y-%m-%d')
+        except ValueError:
+            pass
+        try:
+            return datetime.strptime(text[:10], '%Y-%m-%d').strftime('%Y-%m-%d')
+        except ValueError:
+            return None
+
+    # RFC 822 / RFC 2822 (RSS pubDate): fields are in the feed's local time
+    from email.utils import parsedate_tz
+    parsed = parsedate_tz(text)
+    if parsed and parsed[0]:
+        year, month, day = parsed[:3]
+        if 1 <= month <= 12 and 1 <= day <= 31:
+            return f"{year:04d}-{month:02d}-{day:02d}"
+    return None
+
+
+def struct_to_date(struct):
+    """'YYYY-MM-DD' from a feedparser *_parsed time.struct_time"""
+    if not struct:
+        return None
+    try:
+        return f"{struct[0]:04d}-{struct[1]:02d}-{struct[2]:02d}"
+    except (TypeError, IndexError, ValueError):
+        return None
+
+
+def entry_date(entry):
+    """
+    Aired date of a feedparser entry as (date, field) or (None, None).
+
+    Priority: published > updated > created; for each field the raw string
+    is tried first, then feedparser's parsed struct.
+    """
+    for field in DATE_FIELDS:
+        text = entry.get(field)
+        date = parse_date(text) if isinstance(text, str) else None
+        if not date:
+            date = struct_to_date(entry.get(field + '_parsed'))
+        if date:
+            return date, field
+        if text:
+            logger.debug(f"Could not parse {field} date: {text}")
+    return None, None
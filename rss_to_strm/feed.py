@@ -0,0 +1,465 @@
+"""
+Feed fetching and namespace-aware video/metadata extraction.
+
+Video URL Detection Strategy (Priority Order):
+    1. RSS enclosure links with video/* MIME type (highest reliability)
+    2. Enclosures array with video/* MIME type
+    3. Direct link field (if contains video file extension)
+    4. media: namespace fields (Media RSS)
+    5. content: namespace fields (Content Module)
+    6. Fallback: regex extraction from description/summary (last resort)
+
+feedparser is imported lazily inside get_feed() so importing this module
+stays cheap for callers that only need the extraction helpers.
+"""
+
+import logging
+import re
+
+from .dates import entry_date
+from .records import Item, Metadata
+
+logger = logging.getLogger(__name__)
+
+# Define valid video file extensions
+VALID_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.mov', '.webm', '.m3u8', '.ts', '.flv', '.ogv', '.3gp', '.f4v')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.bmp')
+
+VIDEO_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]*\.(?:mp4|mkv|avi|mov|webm|m3u8|ts|flv|ogv|3gp|f4v)')
+IMG_SRC_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']')
+HTML_TAG_RE = re.compile('<[^<]+?>')
+
+
+def parse_filter_keywords(filter_keywords):
+    """Split a comma-separated keyword string into a lowercase list"""
+    if not filter_keywords:
+        return []
+    return [keyword.strip().lower() for keyword in filter_keywords.split(',') if keyword.strip()]
+
+
+def is_video_url(url):
+    """Check if URL ends with a valid video extension"""
+    if not url:
+        return False
+    # Remove query parameters to check extension
+    base_url = url.split('?')[0].lower()
+    return base_url.endswith(VALID_EXTENSIONS)
+
+
+def is_video_mime_type(mime_type):
+    """Check if MIME type indicates video content"""
+    if not mime_type:
+        return False
+    mime_lower = mime_type.lower()
+    return mime_lower.startswith('video/') or mime_lower in ['application/x-mpegurl', 'application/vnd.apple.mpegurl']
+
+
+def extract_url_from_links_array(entry):
+    """Extract video URL from links array using namespace-aware approach"""
+    if 'links' not in entry:
+        return None, None  # (url, source_description)
+
+    # Priority 1: Look for enclosure with video/* type (RSS 2.0 standard)
+    for link in entry.links:
+        if link.get('rel') == 'enclosure' and is_video_mime_type(link.get('type')):
+            url = link.get('href')
+            if url:
+                logger.debug(f"✓ Found video via RSS enclosure (rel=enclosure, type={link.get('type')})")
+                return url, "rss_enclosure"
+
+    # Priority 2: Look for media:content links (Media RSS namespace)
+    for link in entry.links:
+        if link.get('rel') == 'media' or 'media' in link.get('type', '').lower():
+            url = link.get('href')
+            if url and (is_video_url(url) or is_video_mime_type(link.get('type'))):
+                logger.debug(f"✓ Found video via media: namespace link")
+                return url, "media_link"
+
+    # Priority 3: atom:link with relation that implies video
+    for link in entry.links:
+        link_type = link.get('type', '').lower()
+        if is_video_mime_type(link_type):
+            url = link.get('href')
+            if url:
+                logger.debug(f"✓ Found video via atom:link with video MIME type ({link_type})")
+                return url, "atom_link"
+
+    # Priority 4: alternate links with video file extension
+    for link in entry.links:
+        if link.get('rel') == 'alternate':
+            url = link.get('href')
+            if url and is_video_url(url):
+                logger.debug(f"✓ Found video via alternate link with video extension")
+                return url, "alternate_link"
+
+    # Priority 5: Any other link with video extension
+    for link in entry.links:
+        url = link.get('href')
+        if url and is_video_url(url):
+            logger.debug(f"✓ Found video via generic link")
+            return url, "generic_link"
+
+    return None, None
+
+
+def extract_url_from_enclosures(entry):
+    """Extract video URL from enclosures array"""
+    if 'enclosures' not in entry or not entry.enclosures:
+        return None, None
+
+    for enclosure in entry.enclosures:
+        if is_video_mime_type(enclosure.get('type')):
+            url = enclosure.get('href')
+            if url:
+                logger.debug(f"✓ Found video via enclosures array (type={enclosure.get('type')})")
+                return url, "enclosure_array"
+
+    # Fallback: try any enclosure with video extension
+    for enclosure in entry.enclosures:
+        url = enclosure.get('href')
+        if url and is_video_url(url):
+            logger.debug(f"✓ Found video via enclosure with video extension")
+            return url, "enclosure_fallback"
+
+    return None, None
+
+
+def extract_url_from_direct_link(entry):
+    """Use the entry's 'link' field when it points directly at a video file"""
+    link_url = entry.get('link')
+    if link_url and is_video_url(link_url):
+        logger.debug(f"✓ Found video via direct link field")
+        return link_url, "direct_link"
+    return None, None
+
+
+def extract_url_from_media_namespace(entry):
+    """Extract video URL from media: namespace fields"""
+    # media:content (Media RSS namespace)
+    if 'media_content' in entry and entry.media_content:
+        for media in entry.media_content:
+            if is_video_mime_type(media.get('type')):
+                url = media.get('url')
+                if url:
+                    logger.debug(f"✓ Found video via media:content namespace")
+                    return url, "media_content"
+
+    # media:player
+    if 'media_player' in entry:
+        url = entry.media_player.get('url')
+        if url and is_video_url(url):
+            logger.debug(f"✓ Found video via media:player")
+            return url, "media_player"
+
+    return None, None
+
+
+def extract_url_from_content_namespace(entry):
+    """Extract video URL from content: namespace fields"""
+    # content:encoded
+    if 'content' in entry and isinstance(entry.content, list) and entry.content:
+        for content_item in entry.content:
+            content_value = content_item.get('value', '')
+            # Look for video URLs in HTML-encoded content
+            urls = VIDEO_URL_RE.findall(content_value)
+            if urls:
+                logger.debug(f"✓ Found video via content:encoded namespace")
+                return urls[0], "content_encoded"
+
+    return None, None
+
+
+def extract_url_from_description(entry):
+    """Last resort: extract video URL from summary/description via regex"""
+    for field in ['summary', 'description', 'subtitle']:
+        if field in entry:
+            text = entry.get(field, '')
+            if isinstance(text, str):
+                urls = VIDEO_URL_RE.findall(text)
+                if urls:
+                    logger.debug(f"✓ Found video via regex in {field} field")
+                    return urls[0], "description_regex"
+
+    return None, None
+
+
+# Ordered strategy chain used by extract_video_url()
+URL_STRATEGIES = (
+    extract_url_from_links_array,          # Strategy 1: links array (most structured)
+    extract_url_from_enclosures,           # Strategy 2: enclosures array (RSS 2.0 standard)
+    extract_url_from_direct_link,          # Strategy 3: direct 'link' field
+    extract_url_from_media_namespace,      # Strategy 4: media: namespace (Media RSS)
+    extract_url_from_content_namespace,    # Strategy 5: content: namespace
+    extract_url_from_description,          # Strategy 6: description/summary regex
+)
+
+
+def extract_video_url(entry):
+    """Run the URL strategies in priority order, return (url, source)"""
+    for strategy in URL_STRATEGIES:
+        video_url, source = strategy(entry)
+        if video_url:
+            return video_url, source
+    return None, None
+
+
+def extract_thumbnail(entry):
+    """Extract thumbnail/image URL with namespace awareness, return (url, source)"""
+    # Priority 1: media:thumbnail (Media RSS namespace)
+    if 'media_thumbnail' in entry and entry.media_thumbnail:
+        thumbnail_url = entry.media_thumbnail[0].get('url')
+        if thumbnail_url:
+            logger.debug(f"✓ Extracted thumbnail from media:thumbnail")
+            return thumbnail_url, "media_thumbnail"
+
+    # Priority 2: media:content with thumbnail (Media RSS)
+    if 'media_content' in entry:
+        for media in entry.media_content:
+            if media.get('medium') == 'image' or 'image' in media.get('type', '').lower():
+                thumbnail_url = media.get('url')
+                if thumbnail_url:
+                    logger.debug(f"✓ Extracted thumbnail from media:content")
+                    return thumbnail_url, "media_content_image"
+
+    # Priority 3: image element (various RSS formats)
+    if 'image' in entry:
+        image_data = entry.get('image')
+        if isinstance(image_data, dict):
+            thumbnail_url = image_data.get('url')
+            if thumbnail_url:
+                logger.debug(f"✓ Extracted thumbnail from image element")
+                return thumbnail_url, "image_element"
+        elif isinstance(image_data, str):
+            logger.debug(f"✓ Extracted thumbnail from image string")
+            return image_data, "image_element"
+
+    # Priority 4: RSS enclosure with image MIME type
+    if 'enclosures' in entry:
+        for enclosure in entry.enclosures:
+            if 'image' in enclosure.get('type', '').lower():
+                thumbnail_url = enclosure.get('href')
+                if thumbnail_url:
+                    logger.debug(f"✓ Extracted thumbnail from image enclosure")
+                    return thumbnail_url, "image_enclosure"
+
+    # Priority 5: links array with image relation/type
+    if 'links' in entry:
+        for link in entry.links:
+            link_type = link.get('type', '').lower()
+            link_rel = link.get('rel', '').lower()
+            if 'image' in link_type or 'image' in link_rel or link_rel == 'preview':
+                thumbnail_url = link.get('href')
+                if thumbnail_url:
+                    logger.debug(f"✓ Extracted thumbnail from links (rel={link_rel})")
+                    return thumbnail_url, "image_link"
+
+    # Priority 6: Try to extract from summary/HTML (last resort)
+    if 'summary' in entry:
+        summary = entry.get('summary', '')
+        # Look for img tags with src attributes, filtered for image URLs
+        for url in IMG_SRC_RE.findall(summary):
+            if url.lower().endswith(IMAGE_EXTENSIONS):
+                logger.debug(f"✓ Extracted thumbnail from summary HTML")
+                return url, "summary_html"
+
+    return None, None
+
+
+def entry_title(entry):
+    """Display title of an entry (text before the first ' - ' separator)"""
+    try:
+        return entry['title'].split(" - ")[0]
+    except:
+        return entry['title']
+
+
+def is_filtered(title, filter_list):
+    """Return the first filter keyword matching the title (case-insensitive)"""
+    if filter_list:
+        title_lower = title.lower()
+        for keyword in filter_list:
+            if keyword in title_lower:
+                return keyword
+    return None
+
+
+def extract_metadata(entry, title, video_url):
+    """Extract metadata for the NFO file with namespace awareness, as a compact Metadata record"""
+    metadata = {
+        'title': title,
+        'aired': None,
+        'summary': None,
+        'author': None,
+        'tags': [],
+        'duration': None,
+        'thumbnail': None,
+        'source_url': video_url
+    }
+
+    # 1. Aired date (published > updated > created, see dates.py)
+    metadata['aired'], date_field = entry_date(entry)
+    if metadata['aired']:
+        logger.debug(f"✓ Extracted aired date from '{date_field}': {metadata['aired']}")
+
+    # 2. Description/summary
+    # Priority: content:encoded > summary > subtitle
+    summary_text = None
+
+    # Priority 1: content:encoded (Content Module namespace)
+    if 'content' in entry and isinstance(entry.content, list) and entry.content:
+        content_value = entry.content[0].get('value', '')
+        # Strip HTML tags
+        summary_text = HTML_TAG_RE.sub('', content_value).strip()
+        logger.debug(f"✓ Extracted summary from content:encoded namespace")
+
+    # Priority 2: summary field (standard RSS)
+    if not summary_text and 'summary' in entry:
+        summary_text = entry.get('summary', '').strip()
+        logger.debug(f"✓ Extracted summary from 'summary' field")
+
+    # Priority 3: subtitle (alternative)
+    if not summary_text and 'subtitle' in entry:
+        summary_text = entry.get('subtitle', '').strip()
+        logger.debug(f"✓ Extracted summary from 'subtitle' field")
+
+    # Limit to 500 chars
+    if summary_text:
+        metadata['summary'] = summary_text[:500]
+
+    # 3. Author information (Dublin Core & standard)
+    # Priority: author (dc:creator equivalent) > author_detail
+    if 'author' in entry:
+        metadata['author'] = entry.get('author')
+        logger.debug(f"✓ Extracted author: {metadata['author']}")
+    elif 'author_detail' in entry:
+        author_detail = entry.get('author_detail', {})
+        if isinstance(author_detail, dict):
+            metadata['author'] = author_detail.get('name', author_detail.get('href'))
+            logger.debug(f"✓ Extracted author from author_detail: {metadata['author']}")
+
+    # 4. Tags/categories (RSS categories or custom tags)
+    if 'tags' in entry and entry.tags:
+        metadata['tags'] = [tag.get('term', tag) for tag in entry.tags]
+        logger.debug(f"✓ Extracted tags: {metadata['tags']}")
+
+    # 5. Duration if available (Media RSS namespace)
+    if 'duration' in entry:
+        try:
+            duration_sec = int(entry.get('duration', 0))
+            duration_min = duration_sec // 60
+            metadata['duration'] = f"{duration_min} min"
+            logger.debug(f"✓ Extracted duration: {metadata['duration']}")
+        except:
+            pass
+
+    # 6. Thumbnail/image
+    metadata['thumbnail'], _ = extract_thumbnail(entry)
+
+    return Metadata(**metadata)
+
+
+def extract_entry(entry, filter_list=None, rendition_policy='first', fallback_rendition=False):
+    """
+    Turn one feedparser entry into (title, Item) (see records.py; an Item
+    reads like the former {'url': ..., 'metadata': ...} dict). Returns None
+    when the entry is filtered out or has no video URL.
+
+    rendition_policy / fallback_rendition choose among several video URLs
+    (see renditions.py); a chosen fallback is stored as item['fallback'].
+    """
+    title = entry_title(entry)
+
+    # Check if title should be filtered out (case-insensitive)
+    keyword = is_filtered(title, filter_list)
+    if keyword:
+        logger.info(f"⊘ Filtered out: {title} (matches keyword: '{keyword}')")
+        return None
+
+    video_url, source = extract_video_url(entry)
+    if not video_url:
+        logger.debug(f"⚠ No video URL found for entry: {title}")
+        return None
+
+    fallback = None
+    if rendition_policy != 'first' or fallback_rendition:
+        from .renditions import select_rendition
+        video_url, fallback = select_rendition(entry, video_url, rendition_policy, fallback_rendition)
+
+    metadata = extract_metadata(entry, title, video_url)
+
+    if metadata['thumbnail']:
+        logger.info(f"  Thumbnail: {metadata['thumbnail'][:60]}...")
+
+    logger.info(f"✓ Processing: {title}")
+    logger.info(f"  Video URL: {video_url}")
+    logger.info(f"  Source: {source}")
+    if metadata['aired']:
+        logger.info(f"  Aired: {metadata['aired']}")
+
+    if fallback:
+        logger.info(f"  Fallback: {fallback['url']}")
+    return title, Item(video_url, metadata, fallback)
+
+
+def parse_feed(url):
+    """Fetch and parse a feed (URL, file path or raw document) with feedparser"""
+    import feedparser
+    from . import net
+
+    # Raw documents (bytes, or XML text) are parsed as they are
+    if not isinstance(url, str) or not url.lower().startswith(('http://', 'https://')):
+        if isinstance(url, str) and not url.lstrip().startswith('<'):
+            logger.info(f"Fetching RSS feed from: {url}")
+        else:
+            logger.info(f"Parsing raw feed document ({len(url)} characters/bytes)")
+        return feedparser.parse(url)
+
+    logger.info(f"Fetching RSS feed from: {url}")
+
+    # Download through net so the request shares the per-host rate control
+    with net.urlopen(url) as response:
+        body = response.read()
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        final_url = response.geturl()
+    return feedparser.parse(body, response_headers=dict(headers, **{'content-location': final_url}))
+
+
+#use feedparser to grab rss feed and extract all video urls
+def get_feed(url, filter_list=None, rendition_policy='first', fallback_rendition=False):
+    """
+    Fetch a feed and return {title: Item} (item['url'], item['metadata'], ...).
+
+    filter_list is a list of lowercase keywords; entries whose title contains
+    one of them are skipped (see parse_filter_keywords()).
+    """
+    feed = parse_feed(url)
+
+    logger.debug(f"Feed title: {feed.get('feed', {}).get('title', 'N/A')}")
+    logger.debug(f"Feed version: {feed.get('version', 'N/A')}")
+    logger.debug(f"Number of entries in feed object: {len(feed.get('entries', []))}")
+
+    if not feed.entries:
+        logger.warning("No entries found in RSS feed")
+        logger.warning(f"Feed keys available: {list(feed.keys())}")
+        if feed.get('bozo_exception'):
+            logger.warning(f"Feed parsing error: {feed.bozo_exception}")
+        return {}
+
+    logger.info(f"Found {len(feed.entries)} entries in RSS feed")
+
+    # Detach the entries and pop them one by one so every feedparser object
+    # can be freed as soon as it has been extracted
+    entries = feed.pop('entries')
+    del feed
+    entries.reverse()
+
+    #create dictionary with title and list of video direct urls
+    items = {}
+    while entries:
+        entry = entries.pop()
+        result = extract_entry(entry, filter_list, rendition_policy, fallback_rendition)
+        if result:
+            title, item = result
+            items[title] = item
+
+    return items
@@ -0,0 +1,162 @@
+"""
+Streaming feed download and incremental entry splitting.
+
+feedparser has no incremental API, so the raw body is cut into small
+documents while it is still downloading: each document is the feed preamble
+(root element, namespace declarations, channel fields) plus the entries
+completed by the latest chunk plus the closing tags. feedparser then parses
+those documents one by one, which lets extraction start before the download
+has finished and keeps only about one chunk of XML in memory.
+
+Feeds the splitter cannot cut (no recognisable entries) are handed to
+feedparser as a single document, exactly like before. End tags inside
+CDATA sections and comments are skipped; should a split document still
+fail to parse, the pipeline re-parses the whole body (see
+pipeline.stream_items).
+"""
+
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+ENTRY_START_RE = re.compile(rb'<(item|entry)[\s>/]')
+ENTRY_END = {b'item': b'</item>', b'entry': b'</entry>'}
+DOCUMENT_END = {b'item': b'</channel></rss>', b'entry': b'</feed>'}
+# Sections whose content may contain a literal end tag
+OPAQUE = ((b'<![CDATA[', b']]>'), (b'<!--', b'-->'))
+
+
+def _find_end(buffer, end_tag, position):
+    """Index of end_tag at or after position outside CDATA/comments, -1 if not complete yet"""
+    while True:
+        end = buffer.find(end_tag, position)
+        if end < 0:
+            return -1
+        opaque = [(start, close) for start, close in
+                  ((buffer.find(opener, position, end), closer) for opener, closer in OPAQUE) if start >= 0]
+        if not opaque:
+            return end
+        start, closer = min(opaque)
+        close = buffer.find(closer, start)
+        if close < 0:
+            return -1
+        position = close + len(closer)
+
+
+def iter_feed_chunks(url, chunk_size=CHUNK_SIZE):
+    """Yield the raw feed body in chunks from a URL, file path or file:// URL"""
+    if url.startswith('file://'):
+        url = url[len('file://'):]
+
+    if os.path.exists(url):
+        with open(url, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        return
+
+    if not url.lower().startswith(('http://', 'https://')):
+        # feedparser also accepts the raw document itself
+        yield url.encode('utf-8')
+        return
+
+    import zlib
+    from . import net
+
+    with net.urlopen(url, headers={'Accept-Encoding': 'gzip, deflate'}) as response:
+        encoding = (response.headers.get('Content-Encoding') or '').lower()
+        decompressor = None
+        if encoding == 'gzip':
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == 'deflate':
+            decompressor = zlib.decompressobj()
+
+        while True:
+            chunk = response.read(chunk_size)
+            if not chunk:
+                break
+            yield decompressor.decompress(chunk) if decompressor else chunk
+        if decompressor:
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+
+
+class EntrySplitter:
+    """
+    Incrementally cut a feed body into documents of complete entries.
+
+    feed() accepts the next chunk and returns the documents completed by it;
+    close() returns the unsplit body when no entry was ever found.
+    """
+
+    def __init__(self):
+        self.buffer = b''
+        self.preamble = None
+        self.tag = None
+        self.entries = 0
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        documents = []
+
+        if self.preamble is None:
+            match = ENTRY_START_RE.search(self.buffer)
+            if not match:
+                return documents
+            self.tag = match.group(1)
+            self.preamble = self.buffer[:match.start()]
+            self.buffer = self.buffer[match.start():]
+
+        end_tag = ENTRY_END[self.tag]
+        bodies = []
+        while True:
+            start = ENTRY_START_RE.search(self.buffer)
+            if not start:
+                # Keep a short tail in case a start tag is split across chunks
+                self.buffer = self.buffer[-16:]
+                break
+            end = _find_end(self.buffer, end_tag, start.end())
+            if end < 0:
+                self.buffer = self.buffer[start.start():]
+                break
+            end += len(end_tag)
+            bodies.append(self.buffer[start.start():end])
+            self.entries += 1
+            self.buffer = self.buffer[end:]
+
+        if bodies:
+            # One document per chunk keeps feedparser's per-call overhead low
+            documents.append(self.preamble + b''.join(bodies) + DOCUMENT_END[self.tag])
+        return documents
+
+    def close(self):
+        """Return the whole body if it could not be split, else None"""
+        if self.preamble is None:
+            body, self.buffer = self.buffer, b''
+            return body or None
+        return None
+
+
+def split_documents(chunks):
+    """Yield parseable documents of complete entries from an iterable of raw chunks"""
+    splitter = EntrySplitter()
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+
+    body = splitter.close()
+    if body is not None:
+        logger.debug("Could not split feed into entries, parsing as a single document")
+        yield body
+
+
+def iter_entry_documents(url, chunk_size=CHUNK_SIZE):
+    """Download a feed and yield parseable documents of complete entries as they arrive"""
+    logger.info(f"Fetching RSS feed from: {url}")
+    return split_documents(iter_feed_chunks(url, chunk_size))
@@ -0,0 +1,145 @@
+"""
+Compact index outputs: one file for the whole feed instead of a folder per item.
+
+For very large or fast-moving feeds the folder layout means thousands of
+directories with three or more files each. The index formats write every
+extracted item into a single file, streaming sequentially:
+
+    m3u     extended M3U playlist (#EXTM3U / #EXTINF with duration, logo,
+            group and title, followed by the video URL), UTF-8 encoded, so
+            it doubles as .m3u8
+    json    one JSON document {"feed": ..., "items": [...]}
+    ndjson  one JSON record per line
+
+Records are first spooled (to disk beyond SPOOL_SIZE) while the feed
+streams in, remembering only the last position of each title; a second
+sequential pass writes the kept records, so a repeated title keeps its
+last entry exactly like the item folders do. The file is written to a
+temp name in the target directory and renamed over the previous index
+when complete, so readers never see a partial index and a failed run
+keeps the old one. Thumbnails are referenced by
+their feed URL; nothing else is written next to the index.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ('folders', 'm3u', 'json', 'ndjson')
+EXTENSIONS = {'m3u': '.m3u8', 'json': '.json', 'ndjson': '.ndjson'}
+INDEX_NAME = 'index'
+SPOOL_SIZE = 8 * 1024 * 1024
+
+
+def index_path(output, output_format):
+    """File an index is written to: output itself, or index.<ext> inside an output directory"""
+    if output.endswith(('/', '\\')) or os.path.isdir(output):
+        return os.path.join(output, INDEX_NAME + EXTENSIONS[output_format])
+    return output
+
+
+def item_record(title, item):
+    """Flat JSON-serialisable record of one (title, item) pair"""
+    data = item.to_dict() if hasattr(item, 'to_dict') else dict(item)
+    return dict(title=title, **data)
+
+
+def _duration_seconds(metadata):
+    """Seconds for #EXTINF from the NFO duration ("44 min"), -1 if unknown"""
+    duration = (metadata.get('duration') or '').split()
+    if duration and duration[0].isdigit():
+        return int(duration[0]) * 60
+    return -1
+
+
+def _attribute(value):
+    # #EXTINF attributes are double-quoted and end at the line
+    return ' '.join(str(value).replace('"', "'").split())
+
+
+def _extinf(title, record):
+    metadata = record['metadata']
+    attributes = ''
+    if metadata.get('thumbnail'):
+        attributes += f' tvg-logo="{_attribute(metadata["thumbnail"])}"'
+    if metadata.get('author'):
+        attributes += f' group-title="{_attribute(metadata["author"])}"'
+    return f"#EXTINF:{_duration_seconds(metadata)}{attributes},{' '.join(title.split())}\n"
+
+
+def _write_m3u(f, records, rssurl):
+    from .renditions import rendition_label
+
+    f.write('#EXTM3U\n')
+    for record in records:
+        f.write(_extinf(record['title'], record))
+        f.write(record['url'] + '\n')
+        if record.get('fallback'):
+            f.write(_extinf(f"{record['title']} - {rendition_label(record['fallback'])}", record))
+            f.write(record['fallback']['url'] + '\n')
+
+
+def _write_json(f, records, rssurl):
+    f.write('{"feed": ' + json.dumps(rssurl, ensure_ascii=False) + ', "items": [')
+    for count, record in enumerate(records):
+        f.write(',\n' if count else '\n')
+        json.dump(record, f, ensure_ascii=False)
+    f.write('\n]}\n')
+
+
+def _write_ndjson(f, records, rssurl):
+    for record in records:
+        json.dump(record, f, ensure_ascii=False)
+        f.write('\n')
+
+
+WRITERS = {'m3u': _write_m3u, 'json': _write_json, 'ndjson': _write_ndjson}
+
+
+def _spool_records(items, spool):
+    """Write item records to spool as JSON lines; returns the line numbers to keep (last per title)"""
+    last = {}
+    for number, (title, item) in enumerate(items):
+        spool.write(json.dumps(item_record(title, item), ensure_ascii=False).encode('utf-8') + b'\n')
+        last[title] = number
+    return set(last.values())
+
+
+def _kept_records(spool, keep):
+    spool.seek(0)
+    for number, line in enumerate(spool):
+        if number in keep:
+            yield json.loads(line)
+
+
+def write_index(items, path, output_format, rssurl=None):
+    """
+    Write (title, item) pairs as they arrive into the index file at path.
+
+    Records are spooled first so that, as in folder mode, only the last
+    entry of a repeated title is kept. The previous file is only replaced
+    once all items were written. Returns the number of items.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # Unique temp name per writer; plain open() keeps umask permissions
+    temp_path = os.path.join(directory, f".rss_to_strm_{os.getpid()}-{threading.get_ident()}"
+                                        f"{EXTENSIONS[output_format]}.tmp")
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+            keep = _spool_records(items, spool)
+            with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+                WRITERS[output_format](f, _kept_records(spool, keep), rssurl)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    logger.info(f"Wrote {len(keep)} items to {output_format} index: {path}")
+    return len(keep)
@@ -0,0 +1,111 @@
+"""
+Output directory layouts.
+
+A layout is a path template, one directory level per "/" separated part,
+whose last part names the item folder and must contain {title}. Available
+fields:
+
+    {title}    entry title (as used for the .strm/.nfo file names)
+    {show}     author / dc:creator, "Unknown" if missing
+    {author}   same as {show}
+    {year} {month} {day} {aired}   from the aired date, "Unknown" if missing
+    {initial}  first letter of the title (A-Z, "#" for anything else)
+    {shard}    two hex digits from a hash of the title (256 buckets)
+
+Presets:
+    flat    {title}                          (default, previous behaviour)
+    show    {show}/Season {year}/{title}
+    date    {year}/{year}-{month}/{title}
+    hashed  {shard}/{title}
+    alpha   {initial}/{title}
+
+Every part is sanitised with normalize_filename(), so field values can
+never introduce extra directory levels. When a folder part names a season
+("Season {year}" in the show preset), the NFO <season> is taken from the
+same field so media servers agree with the folder (see item_season()).
+"""
+
+import hashlib
+import re
+
+from .writer import normalize_filename
+
+PRESETS = {
+    'flat': '{title}',
+    'show': '{show}/Season {year}/{title}',
+    'date': '{year}/{year}-{month}/{title}',
+    'hashed': '{shard}/{title}',
+    'alpha': '{initial}/{title}',
+}
+DEFAULT_LAYOUT = 'flat'
+UNKNOWN = 'Unknown'
+SEASON_RE = re.compile(r'\bSeason\s*\{(\w+)\}', re.IGNORECASE)
+
+
+def _fields(part):
+    import string
+    return {name for _, name, _, _ in string.Formatter().parse(part) if name is not None}
+
+
+def resolve_layout(layout):
+    """Expand a preset name to its template and validate the fields"""
+    template = PRESETS.get(layout or DEFAULT_LAYOUT, layout)
+    try:
+        parts = template.strip('/').split('/')
+        fields = [_fields(part) for part in parts]
+        template.format(**layout_fields('x', {}))
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"Invalid layout template {layout!r}: {e}")
+    if not any(fields):
+        raise ValueError(f"Unknown layout {layout!r} (presets: {', '.join(PRESETS)}, or a template with fields)")
+    if 'title' not in fields[-1]:
+        # Otherwise every item's files would end up in the same folder
+        raise ValueError(f"Layout must end with an item folder part containing {{title}}: {layout}")
+    return template
+
+
+def layout_fields(title, metadata):
+    """Template fields for one item"""
+    aired = metadata.get('aired') or ''
+    year, month, day = (aired.split('-') + ['', '', ''])[:3] if aired else ('', '', '')
+    author = metadata.get('author') or UNKNOWN
+    first = title[:1].upper()
+    return {
+        'title': title,
+        'show': author,
+        'author': author,
+        'year': year or UNKNOWN,
+        'month': month or UNKNOWN,
+        'day': day or UNKNOWN,
+        'aired': aired or UNKNOWN,
+        'initial': first if first.isalpha() else '#',
+        'shard': hashlib.md5(title.encode('utf-8')).hexdigest()[:2],
+    }
+
+
+def item_parts(template, title, metadata):
+    """Sanitised path components (relative to the library) for an item folder"""
+    fields = layout_fields(title, metadata)
+    parts = []
+    for part in template.strip('/').split('/'):
+        value = normalize_filename(part.format(**fields)).strip().strip('.')
+        parts.append(value or UNKNOWN)
+    return parts
+
+
+def season_field(template):
+    """Field a folder part names the season after ("Season {year}" -> 'year'), None without one"""
+    for part in template.strip('/').split('/')[:-1]:
+        match = SEASON_RE.search(part)
+        if match:
+            return match.group(1)
+    return None
+
+
+def item_season(template, title, metadata):
+    """NFO season number of an item's season folder; None if there is none or it is not a number"""
+    field = season_field(template)
+    if field is None:
+        return None
+    value = layout_fields(title, metadata)[field]
+    return int(value) if value.isdigit() else None
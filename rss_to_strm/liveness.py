@@ -0,0 +1,173 @@
+"""
+Video URL liveness checks with a TTL result cache.
+
+Mediathek links expire; a .strm pointing at a dead URL makes players hang
+until they time out. When enabled, every extracted video URL is probed
+with a HEAD request (falling back to a one-byte ranged GET for servers
+that reject HEAD) on a thread pool, and the result is cached in the state
+directory. Later runs only re-probe URLs that are new or whose cached
+result is older than the TTL.
+
+Dead URLs are either dropped (no .strm is written) or flagged (the item is
+kept and its NFO gets an "offline" tag). If an item has a fallback
+rendition that is alive, it is promoted instead.
+"""
+
+import collections
+import logging
+import os
+import threading
+import time
+
+from . import state
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = 'liveness.json'
+DEFAULT_TTL = 6 * 3600
+DEFAULT_WORKERS = 16
+PROBE_TIMEOUT = 10
+ACTIONS = ('drop', 'flag')
+
+
+class LivenessCache:
+    """Thread-safe {url: {'alive', 'status', 'checked'}} map persisted as JSON"""
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = state.load_json(path, {}) if path else {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url):
+        """Cached result for url if it is younger than the TTL"""
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry and time.time() - entry.get('checked', 0) < self.ttl:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def put(self, url, result):
+        with self.lock:
+            self.entries[url] = result
+
+    def save(self):
+        """Persist fresh entries; expired ones are pruned to keep the file small"""
+        if not self.path:
+            return
+        now = time.time()
+        with self.lock:
+            self.entries = {url: entry for url, entry in self.entries.items()
+                            if now - entry.get('checked', 0) < self.ttl}
+            data = dict(self.entries)
+        state.save_json(self.path, data)
+
+
+def probe_url(url, timeout=PROBE_TIMEOUT):
+    """Check whether a video URL answers; returns {'alive', 'status', 'checked'}"""
+    import urllib.error
+    from . import net
+
+    status = None
+    error = None
+    for method, headers in (('HEAD', None), ('GET', {'Range': 'bytes=0-0'})):
+        try:
+            with net.urlopen(url, method=method, headers=headers, timeout=timeout) as response:
+                status = response.status
+                error = None
+                break
+        except urllib.error.HTTPError as e:
+            status, error = e.code, str(e)
+            # Some CDNs reject HEAD but serve ranged GETs
+            if e.code not in (403, 405, 501):
+                break
+        except Exception as e:
+            status, error = None, str(e)
+
+    result = {'alive': status is not None and status < 400, 'status': status, 'checked': time.time()}
+    if error and not result['alive']:
+        result['error'] = error[:200]
+    return result
+
+
+class LivenessChecker:
+    """Probe URLs concurrently, consulting and filling a LivenessCache"""
+
+    def __init__(self, cache, workers=DEFAULT_WORKERS, timeout=PROBE_TIMEOUT):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.cache = cache
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rss-to-strm-probe')
+
+    def check(self, url):
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached
+        result = probe_url(url, self.timeout)
+        self.cache.put(url, result)
+        if not result['alive']:
+            logger.debug(f"✗ Dead URL ({result['status']}): {url}")
+        return result
+
+    def submit(self, url):
+        return self.pool.submit(self.check, url)
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        self.cache.save()
+
+
+def validate_items(items, checker, action='drop', window=64):
+    """
+    Yield (title, item) pairs after their video URL has been checked.
+
+    Up to window probes are in flight at once; output order is preserved.
+    """
+    pending = collections.deque()
+    dropped = 0
+
+    def resolve(title, item, future):
+        result = future.result()
+        if result['alive']:
+            return item
+        fallback = item.get('fallback')
+        if fallback and checker.check(fallback['url'])['alive']:
+            logger.info(f"↻ Video URL dead ({result['status']}), using fallback rendition: {title}")
+            item['url'] = fallback['url']
+            item['metadata']['source_url'] = fallback['url']
+            del item['fallback']
+            return item
+        if action == 'flag':
+            logger.warning(f"⚠ Video URL dead ({result['status']}), flagged offline: {title}")
+            item['metadata']['offline'] = True
+            return item
+        logger.warning(f"⊘ Video URL dead ({result['status']}), skipped: {title}")
+        return None
+
+    def flush(limit):
+        nonlocal dropped
+        while len(pending) > limit:
+            title, item, future = pending.popleft()
+            item = resolve(title, item, future)
+            if item is None:
+                dropped += 1
+            else:
+                yield title, item
+
+    for title, item in items:
+        pending.append((title, item, checker.submit(item['url'])))
+        yield from flush(window)
+    yield from flush(0)
+
+    logger.info(f"URL check: {checker.cache.hits} cached, {checker.cache.misses} probed, {dropped} dropped")
+
+
+def open_checker(state_dir, ttl=DEFAULT_TTL, workers=DEFAULT_WORKERS):
+    """LivenessChecker backed by the cache file in state_dir"""
+    cache = LivenessCache(os.path.join(state_dir, CACHE_FILE), ttl=ttl)
+    return LivenessChecker(cache, workers=workers)
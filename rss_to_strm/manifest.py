@@ -0,0 +1,69 @@
+"""
+Library manifest: which item lives where, and which thumbnail it has.
+
+Stored as a hidden JSON file in the library root and written into the temp
+directory before the swap, so it always describes the library next to it.
+The next run reads the manifest of the library it is about to replace and
+reuses files (currently thumbnails) by hard link or copy instead of
+downloading them again, which also makes switching layouts incremental:
+items simply move to their new folders.
+"""
+
+import logging
+import os
+import threading
+
+from . import state
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = '.rss-to-strm-manifest.json'
+VERSION = 1
+
+
+class Manifest:
+    """{title: {'path', 'url', 'thumbnail_url', 'thumbnail'}} for one library"""
+
+    def __init__(self, library, items=None):
+        self.library = library
+        self.items = items or {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, library):
+        """Manifest of an existing library (empty if none)"""
+        if not library or not os.path.isdir(library):
+            return cls(library)
+        data = state.load_json(os.path.join(library, MANIFEST_FILE), {})
+        if data.get('version') != VERSION:
+            return cls(library)
+        return cls(library, data.get('items', {}))
+
+    def get(self, title):
+        return self.items.get(title)
+
+    def record(self, title, **fields):
+        with self.lock:
+            self.items.setdefault(title, {}).update(fields)
+
+    def forget(self, title):
+        with self.lock:
+            return self.items.pop(title, None)
+
+    def save(self):
+        state.save_json(os.path.join(self.library, MANIFEST_FILE),
+                        {'version': VERSION, 'items': self.items})
+
+    def reusable_thumbnail(self, title, thumbnail_url):
+        """Absolute path of this item's previously downloaded thumbnail, if still valid"""
+        entry = self.items.get(title)
+        if not entry or entry.get('thumbnail_url') != thumbnail_url or not entry.get('thumbnail'):
+            return None
+        path = os.path.join(self.library, entry['thumbnail'])
+        try:
+            if os.path.getsize(path) > 0:
+                return path
+        except OSError:
+            pass
+        return None
+
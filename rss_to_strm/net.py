@@ -0,0 +1,68 @@
+"""
+Network helpers shared by feed fetching and thumbnail downloads.
+
+SSL verification is bypassed per request (many mediathek CDNs ship broken
+certificate chains) instead of patching the process-wide default context,
+so importing the package never changes global interpreter state.
+
+Every request goes through a per-host rate controller that backs off on
+429/503 and retries after Retry-After (see ratelimit.py).
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 30
+USER_AGENT = "rss-to-strm/1.0 (+https://github.com/sebastianruff/RSS-2-strm)"
+
+_ssl_context = None
+_rate_controller = None
+
+
+def unverified_ssl_context():
+    """Return a cached SSL context that skips certificate verification"""
+    global _ssl_context
+    if _ssl_context is None:
+        import ssl
+        ctx = ssl.create_default_context()
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+        _ssl_context = ctx
+    return _ssl_context
+
+
+def rate_controller():
+    """Process-wide per-host rate controller (see ratelimit.py)"""
+    global _rate_controller
+    if _rate_controller is None:
+        from .ratelimit import RateController
+        _rate_controller = RateController()
+    return _rate_controller
+
+
+def _open(url, method=None, headers=None, timeout=DEFAULT_TIMEOUT, data=None):
+    import urllib.request
+    request_headers = {'User-Agent': USER_AGENT}
+    if headers:
+        request_headers.update(headers)
+    request = urllib.request.Request(url, data=data, headers=request_headers, method=method)
+    return urllib.request.urlopen(request, context=unverified_ssl_context(), timeout=timeout)
+
+
+def urlopen(url, method=None, headers=None, timeout=DEFAULT_TIMEOUT, data=None):
+    """Open a URL with the shared SSL context and default headers, under the host's rate limits"""
+    return rate_controller().call(url, lambda: _open(url, method, headers, timeout, data))
+
+
+def fetch_bytes(url, timeout=DEFAULT_TIMEOUT):
+    """Download a URL and return the response body"""
+    def download():
+        with _open(url, timeout=timeout) as response:
+            return response.read()
+    return rate_controller().call(url, download)
+
+
+def rate_summary():
+    """Per-host throttling statistics of this process ({} if nothing was throttled)"""
+    return _rate_controller.summary() if _rate_controller else {}
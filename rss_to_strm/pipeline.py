@@ -0,0 +1,456 @@
+"""
+End-to-end run: fetch feed, write into a temp directory, swap into place.
+
+Stages (each connected by a bounded queue, so peak memory does not grow
+with the size of the feed):
+
+    fetch ──► extract ──► write (.strm/.nfo) ──► thumbnail downloads
+   (thread)   (thread)      (caller thread)       (thread pool)
+
+File Operations:
+    - Atomic replacement: writes to temp directory first, swaps on success
+    - Rollback on error: preserves existing output on failure
+"""
+
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+from . import net
+from .coordination import LibraryLock
+from .feed import extract_entry, parse_filter_keywords
+from .fetch import iter_feed_chunks
+from .index import index_path, write_index
+from .layout import DEFAULT_LAYOUT, PRESETS, resolve_layout
+from .manifest import Manifest
+from .snapshots import DEFAULT_KEEP, FeedUnchanged, SnapshotStore, config_fingerprint, resolve_replay
+from .state import default_state_dir
+from .writer import LibraryWriter
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 64
+SPOOL_SIZE = 8 * 1024 * 1024
+THUMBNAIL_WORKERS = 4
+
+_DONE = object()
+
+
+class _Stage(threading.Thread):
+    """Background stage that forwards results into a bounded queue"""
+
+    def __init__(self, name, produce, output, stop):
+        super().__init__(name=name, daemon=True)
+        self.produce = produce
+        self.output = output
+        self.stop = stop
+        self.error = None
+
+    def run(self):
+        try:
+            for item in self.produce():
+                if not _put(self.output, item, self.stop):
+                    return
+        except BaseException as e:
+            self.error = e
+            self.stop.set()
+        finally:
+            _put(self.output, _DONE, self.stop)
+
+
+def _put(q, item, stop):
+    """Blocking put that gives up once the pipeline is being torn down"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _drain(q, stop):
+    """Yield queue items until the producer signals completion"""
+    while True:
+        try:
+            item = q.get(timeout=0.1)
+        except queue.Empty:
+            if stop.is_set():
+                return
+            continue
+        if item is _DONE:
+            return
+        yield item
+
+
+def _split_failed(parsed, document):
+    """True if a split document lost entries or hit a real parse error (not just an encoding note)"""
+    import feedparser
+    from .fetch import ENTRY_START_RE
+
+    if len(parsed.entries) < len(ENTRY_START_RE.findall(document)):
+        return True
+    benign = (feedparser.CharacterEncodingOverride, feedparser.NonXMLContentType)
+    return bool(parsed.get('bozo')) and not isinstance(parsed.get('bozo_exception'), benign)
+
+
+def stream_items(url, filter_list=None, rendition_policy='first', fallback_rendition=False,
+                 chunks=None, queue_size=QUEUE_SIZE):
+    """
+    Yield (title, item) pairs while the feed is still downloading.
+
+    Fetching runs in one background thread and feedparser parsing plus
+    extraction in another; both hand over through bounded queues. chunks
+    replaces the download with any iterable of raw body chunks.
+
+    The raw body is also spooled (to disk beyond SPOOL_SIZE): if a split
+    document fails to parse, the remaining entries are taken from one
+    parse of the whole body instead.
+    """
+    import feedparser
+    from .fetch import split_documents
+
+    stop = threading.Event()
+    documents = queue.Queue(maxsize=queue_size)
+    extracted = queue.Queue(maxsize=queue_size)
+    counts = {'entries': 0, 'items': 0}
+    raw = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+
+    def spool(source):
+        for chunk in source:
+            raw.write(chunk)
+            yield chunk
+
+    def extract_all(entries):
+        for entry in entries:
+            counts['entries'] += 1
+            result = extract_entry(entry, filter_list, rendition_policy, fallback_rendition)
+            if result:
+                counts['items'] += 1
+                yield result
+
+    def extract():
+        failed = False
+        for document in _drain(documents, stop):
+            if failed:
+                continue  # let the fetcher finish the spooled body
+            parsed = feedparser.parse(document)
+            if _split_failed(parsed, document):
+                logger.warning(f"Could not parse split feed document "
+                               f"({parsed.get('bozo_exception') or 'entries lost'}) - parsing the whole feed")
+                failed = True
+                continue
+            yield from extract_all(parsed.entries)
+        if fetcher.error:
+            raise fetcher.error
+        if failed and not stop.is_set():
+            raw.seek(0)
+            parsed = feedparser.parse(raw.read())
+            if parsed.get('bozo_exception') and not parsed.entries:
+                logger.warning(f"Feed parsing error: {parsed.bozo_exception}")
+            # Entries before the failed document were already extracted
+            yield from extract_all(parsed.entries[counts['entries']:])
+
+    if chunks is None:
+        logger.info(f"Fetching RSS feed from: {url}")
+        chunks = iter_feed_chunks(url)
+
+    fetcher = _Stage('rss-to-strm-fetch', lambda: split_documents(spool(chunks)), documents, stop)
+    extractor = _Stage('rss-to-strm-extract', extract, extracted, stop)
+    fetcher.start()
+    extractor.start()
+
+    try:
+        yield from _drain(extracted, stop)
+    finally:
+        stop.set()
+        fetcher.join()
+        extractor.join()
+        raw.close()
+
+    for stage in (fetcher, extractor):
+        if stage.error:
+            raise stage.error
+    if not counts['entries']:
+        logger.warning("No entries found in RSS feed")
+
+
+def write_items(items, library, download_thumbnails=True,
+                thumbnail_workers=THUMBNAIL_WORKERS, queue_size=QUEUE_SIZE, layout=None, previous=None):
+    """
+    Write (title, item) pairs below library as they arrive.
+
+    Thumbnail downloads run on a thread pool while later items are being
+    written; at most queue_size downloads are queued at any time. layout
+    places the item folders (see layout.py); previous is the manifest of the
+    library being replaced, whose thumbnails are reused where possible.
+
+    Returns (items written, thumbnails that could not be saved).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not os.path.exists(library):
+        logger.debug(f"Creating library directory: {library}")
+        os.mkdir(library)
+
+    writer = LibraryWriter(library, layout=layout, previous=previous)
+    slots = threading.BoundedSemaphore(queue_size)
+    pending = {}  # title -> future of its thumbnail job while in flight
+    failed = []   # futures of jobs that raised (e.g. the NFO could not be written)
+    lock = threading.Lock()
+    count = 0
+
+    def download(job):
+        try:
+            job()
+        finally:
+            slots.release()
+
+    def finished(title, future):
+        with lock:
+            if pending.get(title) is future:
+                del pending[title]
+            if future.exception() is not None:
+                failed.append(future)
+
+    with ThreadPoolExecutor(max_workers=thumbnail_workers, thread_name_prefix='rss-to-strm-thumb') as pool:
+        for title, item in items:
+            if failed:
+                break
+            with lock:
+                earlier = pending.get(title)
+            if earlier:
+                # Same title again: the later entry replaces the item once the earlier job is done
+                earlier.result()
+            thumbnail_job = writer.write(title, item, download_thumbnails=download_thumbnails)
+            count += 1
+            if thumbnail_job:
+                slots.acquire()
+                future = pool.submit(download, thumbnail_job)
+                with lock:
+                    pending[title] = future
+                future.add_done_callback(lambda future, title=title: finished(title, future))
+
+    # A failed job must fail the run instead of swapping in an incomplete library
+    for future in failed:
+        future.result()
+
+    writer.close()
+    if writer.reused:
+        logger.info(f"Reused {writer.reused} thumbnails from the previous library")
+    blob_stats = writer.blobs.stats
+    if blob_stats['stored'] or blob_stats['deduplicated']:
+        logger.info(f"Thumbnails: {blob_stats['downloads']} downloaded, {blob_stats['stored']} unique images stored, "
+                    f"{blob_stats['deduplicated']} duplicates linked")
+    if writer.missing:
+        logger.warning(f"{writer.missing} thumbnails could not be saved")
+    logger.info(f"Processed {count} items")
+    return count, writer.missing
+
+
+def run(rssurl, output_library, filter_keywords="", rendition_policy='first', fallback_rendition=False,
+        check_urls=False, dead_urls='drop', url_cache_ttl=None, state_dir=None,
+        snapshots=DEFAULT_KEEP, force=False, replay=None, layout=None, lock='skip', lock_timeout=None,
+        body=None, output_format='folders'):
+    """
+    Convert one feed into output_library. Safe to call repeatedly in-process.
+
+    rendition_policy picks among several video renditions per entry and
+    fallback_rendition additionally writes a second .strm version
+    (see renditions.py). check_urls probes every video URL before writing
+    and drops or flags dead ones (dead_urls), caching results for
+    url_cache_ttl seconds in state_dir (see liveness.py, state.py).
+
+    The raw body is hashed and the newest `snapshots` bodies are kept; an
+    unchanged feed skips all processing unless force is set (snapshots=0
+    disables both). replay runs against a stored snapshot ('latest' or a
+    path) without network access (see snapshots.py).
+
+    layout nests the item folders, e.g. 'show' or '{shard}/{title}' (see
+    layout.py). The library's manifest lets the next run reuse thumbnails,
+    so changing the layout moves items without downloading them again.
+
+    output_format 'm3u', 'json' or 'ndjson' writes a single index file
+    instead of item folders (see index.py); output_library is then the
+    file, or a directory that receives index.<ext>.
+
+    body is feed content that was already received (e.g. a WebSub push,
+    see websub.py) and replaces the download of rssurl.
+
+    The output library is locked for the duration of the run (see
+    coordination.py): with lock='skip' a concurrent run is skipped, with
+    'wait' it waits up to lock_timeout seconds (None: forever), 'off'
+    disables locking.
+
+    Returns True when the library was replaced (or the run was skipped
+    because the feed is unchanged), None when it was skipped because the
+    library is busy, False when the run failed and the existing output
+    was retained.
+    """
+    options = dict(filter_keywords=filter_keywords, rendition_policy=rendition_policy,
+                   fallback_rendition=fallback_rendition, check_urls=check_urls, dead_urls=dead_urls,
+                   url_cache_ttl=url_cache_ttl, state_dir=state_dir, snapshots=snapshots,
+                   force=force, replay=replay, layout=layout, body=body, output_format=output_format)
+    if output_format != 'folders':
+        output_library = index_path(output_library, output_format)
+    if lock == 'off':
+        return _run(rssurl, output_library, **options)
+
+    library_lock = LibraryLock(output_library)
+    if not library_lock.acquire(lock, lock_timeout):
+        holder = library_lock.holder() or {}
+        logger.warning(f"Output library is locked by another run "
+                       f"(pid {holder.get('pid')} on {holder.get('host')}) - skipping: {output_library}")
+        return None if lock == 'skip' else False
+    try:
+        return _run(rssurl, output_library, **options)
+    finally:
+        library_lock.release()
+
+
+def _run(rssurl, output_library, filter_keywords, rendition_policy, fallback_rendition, check_urls,
+         dead_urls, url_cache_ttl, state_dir, snapshots, force, replay, layout, body, output_format):
+    filter_list = parse_filter_keywords(filter_keywords)
+    if filter_list:
+        logger.info(f"Filter keywords active: {filter_list}")
+
+    logger.info(f"Configuration - RSS URL: {rssurl}")
+    logger.info(f"Configuration - Output Library: {output_library}")
+    logger.info(f"Configuration - Absolute Output Library Path: {os.path.abspath(output_library)}")
+    if rendition_policy != 'first':
+        logger.info(f"Configuration - Rendition policy: {rendition_policy}")
+
+    if output_format != 'folders':
+        logger.info(f"Configuration - Output format: {output_format}")
+    template = resolve_layout(layout)
+    if template != PRESETS[DEFAULT_LAYOUT] and output_format == 'folders':
+        logger.info(f"Configuration - Layout: {template}")
+
+    if state_dir is None:
+        state_dir = default_state_dir(output_library)
+
+    fingerprint = config_fingerprint(filter_list=filter_list, rendition_policy=rendition_policy,
+                                     fallback_rendition=fallback_rendition,
+                                     check_urls=check_urls, dead_urls=dead_urls, layout=template,
+                                     output_format=output_format)
+    store = None
+    recorder = None
+    download_thumbnails = True
+
+    if replay:
+        # Offline: stored body, no thumbnail downloads, no URL probes
+        try:
+            snapshot = resolve_replay(replay, state_dir, rssurl)
+        except FileNotFoundError as e:
+            logger.error(f"Cannot replay: {e}")
+            logger.error("Script failed - existing output retained")
+            return False
+        logger.info(f"Replaying feed snapshot (no network): {snapshot}")
+        chunks = iter_feed_chunks(snapshot)
+        download_thumbnails = False
+        check_urls = False
+    elif snapshots:
+        store = SnapshotStore(state_dir, rssurl, keep=snapshots)
+        last = store.last_success(output_library)
+        previous = None
+        if last and not last.get('complete', True):
+            logger.info("Last run was incomplete (thumbnails missing) - processing the feed even if unchanged")
+        elif last and not force and last.get('fingerprint') == fingerprint and os.path.exists(output_library):
+            previous = os.path.join(store.directory, last['file'])
+            if check_urls:
+                from . import liveness
+                ttl = liveness.DEFAULT_TTL if url_cache_ttl is None else url_cache_ttl
+                if time.time() - last.get('time', 0) >= ttl:
+                    logger.info("URL check results have expired - processing the feed even if unchanged")
+                    previous = None
+        recorder = store.recorder(previous)
+        chunks = recorder.wrap(iter_feed_chunks(rssurl) if body is None else iter([body]))
+    else:
+        chunks = None if body is None else iter([body])
+
+    def record_success(complete=True):
+        if recorder:
+            store.mark_success(store.commit(recorder), recorder.digest, fingerprint, output_library, complete)
+        else:
+            # A replayed or unrecorded body: the last recorded success no longer describes the library
+            SnapshotStore(state_dir, rssurl).forget(output_library)
+
+    temp_dir = None
+    if output_format == 'folders':
+        # Create files in a temporary directory first, on the same filesystem as
+        # the output so the final move is a rename that keeps thumbnail hard links
+        parent = os.path.dirname(os.path.abspath(output_library.rstrip('/\\') or '.'))
+        os.makedirs(parent, exist_ok=True)
+        temp_dir = tempfile.mkdtemp(prefix='.rss_to_strm_', dir=parent)
+        logger.info(f"Writing to temporary directory: {temp_dir}")
+
+    checker = None
+    unchanged = False
+    try:
+        if body is not None:
+            logger.info(f"Using received feed content ({len(body)} bytes) for: {rssurl}")
+        elif chunks is not None:
+            logger.info(f"Fetching RSS feed from: {rssurl}")
+        items = stream_items(rssurl, filter_list, rendition_policy, fallback_rendition, chunks=chunks)
+        if check_urls:
+            from . import liveness
+            ttl = liveness.DEFAULT_TTL if url_cache_ttl is None else url_cache_ttl
+            checker = liveness.open_checker(state_dir, ttl=ttl)
+            items = liveness.validate_items(items, checker, action=dead_urls)
+
+        if temp_dir is None:
+            # Index formats replace their single file atomically themselves
+            write_index(items, output_library, output_format, rssurl=rssurl)
+            record_success()
+            logger.info("Script completed successfully")
+            return True
+
+        _, missing_thumbnails = write_items(items, temp_dir, download_thumbnails=download_thumbnails,
+                                            layout=template, previous=Manifest.load(output_library))
+        for host, stats in net.rate_summary().items():
+            logger.info(f"Throttled by {host}: {stats['throttled']} times, {stats['retried']} requests retried, "
+                        f"now at {stats['rate']} requests/s with {stats['concurrency']} concurrent")
+        logger.info("All files written successfully to temporary directory")
+
+        # If successful, replace the old output_library with the new one
+        if os.path.exists(output_library):
+            logger.info(f"Removing old output directory: {output_library}")
+            shutil.rmtree(output_library)
+
+        logger.info(f"Moving temporary directory to final location: {output_library}")
+        shutil.move(temp_dir, output_library)
+
+        # Missing thumbnails: let the next run retry them even if the feed is unchanged
+        record_success(complete=not missing_thumbnails)
+
+        logger.info("Script completed successfully")
+        return True
+
+    except FeedUnchanged as e:
+        logger.info(f"Feed unchanged since last successful run (sha256 {str(e)[:12]}) - nothing to do")
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        unchanged = True
+        return True
+
+    except Exception as e:
+        logger.error(f"Error during file generation: {e}")
+        if temp_dir:
+            logger.info("Cleaning up temporary directory without modifying existing output")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        logger.error("Script failed - existing output retained")
+        return False
+
+    finally:
+        if checker:
+            checker.close()
+        if recorder and not recorder.path:
+            # Keep complete bodies of failed runs for investigation
+            if recorder.digest and not unchanged:
+                store.commit(recorder)
+            else:
+                recorder.discard()
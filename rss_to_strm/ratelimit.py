@@ -0,0 +1,179 @@
+"""
+Adaptive per-host rate control.
+
+Every request made through net.py passes the limiter of its host:
+
+    - a token bucket caps the request rate (requests/second, small burst)
+    - a concurrency window caps the requests in flight
+    - both adapt with AIMD: each success adds a little (additive increase),
+      each 429/503 halves them (multiplicative decrease)
+    - a 429 (or a 503 carrying Retry-After) blocks the host until its
+      Retry-After (seconds or HTTP date) or an exponential backoff has
+      passed, and the request is queued again instead of failing
+
+So many thumbnail downloads or URL probes against one CDN settle at the
+highest throughput the host tolerates, without losing items to throttling.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUS = 429
+RETRY_AFTER_STATUSES = (429, 503)
+INITIAL_RATE = 50.0          # requests per second
+MIN_RATE = 0.5
+MAX_RATE = 200.0
+RATE_STEP = 0.5              # added per successful request
+INITIAL_CONCURRENCY = 8
+MAX_CONCURRENCY = 64
+MAX_RETRIES = 5
+BACKOFF = 1.0                # seconds, doubled per consecutive throttle
+MAX_RETRY_AFTER = 300        # longer requested pauses fail the request instead
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    from email.utils import parsedate_to_datetime
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class HostLimiter:
+    """Token bucket plus AIMD concurrency window for one host"""
+
+    def __init__(self, host, rate=INITIAL_RATE, concurrency=INITIAL_CONCURRENCY):
+        self.host = host
+        self.rate = rate
+        self.tokens = min(rate, INITIAL_CONCURRENCY)
+        self.limit = float(concurrency)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.throttles = 0
+        self.updated = time.monotonic()
+        self.condition = threading.Condition()
+        self.stats = {'requests': 0, 'throttled': 0, 'retried': 0}
+
+    def _refill(self, now):
+        self.tokens = min(max(self.rate, 1.0), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a request to this host may start"""
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.in_flight >= int(self.limit):
+                    wait = None
+                elif self.tokens < 1:
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    self.stats['requests'] += 1
+                    return
+                self.condition.wait(wait)
+
+    def success(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.throttles = 0
+            self.limit = min(MAX_CONCURRENCY, self.limit + 1 / self.limit)
+            self.rate = min(MAX_RATE, self.rate + RATE_STEP)
+            self.condition.notify_all()
+
+    def throttled(self, retry_after=None):
+        """Record a throttling response; returns the pause requested for the host"""
+        with self.condition:
+            self.in_flight -= 1
+            self.throttles += 1
+            self.stats['throttled'] += 1
+            self.limit = max(1.0, self.limit / 2)
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self.tokens = min(self.tokens, 0)
+            pause = retry_after if retry_after is not None else BACKOFF * 2 ** (self.throttles - 1)
+            # A request asked to wait longer gives up (see RateController.call); the
+            # host itself is never blocked beyond MAX_RETRY_AFTER for the other requests
+            self.blocked_until = max(self.blocked_until, time.monotonic() + min(pause, MAX_RETRY_AFTER))
+            self.condition.notify_all()
+            return pause
+
+    def failed(self):
+        """Request ended with an error that says nothing about load"""
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+
+class RateController:
+    """Per-host limiters shared by all threads of a process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hosts = {}
+
+    def limiter(self, url):
+        from urllib.parse import urlsplit
+
+        host = (urlsplit(url).hostname or '').lower()
+        with self.lock:
+            limiter = self.hosts.get(host)
+            if limiter is None:
+                limiter = self.hosts[host] = HostLimiter(host)
+            return limiter
+
+    def call(self, url, operation):
+        """
+        Run operation() (one request) under the host's limits.
+
+        Throttled attempts (see module docstring) are queued again after the host's pause,
+        up to MAX_RETRIES times; the last HTTPError is raised after that.
+        """
+        import urllib.error
+
+        limiter = self.limiter(url)
+        for attempt in range(MAX_RETRIES + 1):
+            limiter.acquire()
+            try:
+                result = operation()
+            except urllib.error.HTTPError as e:
+                retry_after = None
+                if e.code in RETRY_AFTER_STATUSES and e.headers:
+                    retry_after = parse_retry_after(e.headers.get('Retry-After'))
+                # A bare 503 is as likely an outage or a dead stream as throttling
+                if e.code != THROTTLE_STATUS and retry_after is None:
+                    limiter.failed()
+                    raise
+                pause = limiter.throttled(retry_after)
+                if attempt == MAX_RETRIES or pause > MAX_RETRY_AFTER:
+                    raise
+                e.close()
+                with limiter.condition:
+                    limiter.stats['retried'] += 1
+                logger.debug(f"HTTP {e.code} from {limiter.host}, retrying in {pause:.1f}s "
+                             f"(rate {limiter.rate:.1f}/s, concurrency {int(limiter.limit)}): {url}")
+                continue
+            except BaseException:
+                limiter.failed()
+                raise
+            limiter.success()
+            return result
+
+    def summary(self):
+        """{host: stats} for hosts that were throttled at least once"""
+        with self.lock:
+            return {host: dict(limiter.stats, rate=round(limiter.rate, 1), concurrency=int(limiter.limit))
+                    for host, limiter in self.hosts.items() if limiter.stats['throttled']}
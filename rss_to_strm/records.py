@@ -0,0 +1,101 @@
+"""
+Compact records for extracted items.
+
+A feed with tens of thousands of entries used to keep one dict per item
+plus a nested metadata dict (with its own copy of every author and tag
+string) alive until writing finished. Item and Metadata use __slots__
+instead, and strings that repeat across entries (author, tags, duration)
+are interned so each distinct value is stored once.
+
+Both classes still support the mapping access the dict-based API offered
+(item['url'], metadata.get('thumbnail'), 'fallback' in item, ...), so
+code written against get_feed()'s old return value keeps working.
+"""
+
+import sys
+
+
+def intern_text(value):
+    """Intern a repeated short string (None and non-strings pass through)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _Record:
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        self[key] = None
+
+    def __contains__(self, key):
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def keys(self):
+        return [key for key in self.__slots__ if getattr(self, key) is not None]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def __eq__(self, other):
+        if isinstance(other, _Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Metadata(_Record):
+    """NFO metadata of one item (see feed.extract_metadata)"""
+
+    __slots__ = ('title', 'aired', 'summary', 'author', 'tags', 'duration', 'thumbnail', 'source_url', 'offline')
+
+    def __init__(self, title, aired=None, summary=None, author=None, tags=(), duration=None,
+                 thumbnail=None, source_url=None, offline=None):
+        self.title = title
+        self.aired = aired
+        self.summary = summary
+        self.author = intern_text(author)
+        self.tags = tuple(intern_text(tag) for tag in tags)
+        self.duration = intern_text(duration)
+        self.thumbnail = thumbnail
+        self.source_url = source_url
+        self.offline = offline
+
+    def to_dict(self):
+        data = {key: getattr(self, key) for key in self.__slots__}
+        data['tags'] = list(self.tags)
+        if not self.offline:
+            del data['offline']
+        return data
+
+
+class Item(_Record):
+    """One extracted feed entry: video URL, metadata and optional fallback rendition"""
+
+    __slots__ = ('url', 'metadata', 'fallback')
+
+    def __init__(self, url, metadata, fallback=None):
+        self.url = url
+        self.metadata = metadata
+        self.fallback = fallback
+
+    def to_dict(self):
+        data = {'url': self.url, 'metadata': self.metadata.to_dict()}
+        if self.fallback:
+            data['fallback'] = self.fallback
+        return data
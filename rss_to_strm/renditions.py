@@ -0,0 +1,223 @@
+"""
+Rendition selection for entries that list several video URLs.
+
+Mediathek and Media RSS entries often carry the same video in several
+qualities (multiple <media:content> or <enclosure> elements). The URL
+strategies in feed.py return the first video-typed match; with a policy
+other than "first", all candidates are collected with whatever quality
+hints the feed declares (bitrate, resolution, file size) or the URL
+reveals (1080p, 3360k, _webxl, .xl.mp4, ...) and one is picked.
+
+Policies:
+    first              keep the URL found by the strategy chain (default)
+    highest            highest quality rendition
+    lowest             lowest quality rendition
+    prefer-hls         HLS (.m3u8) stream if present, else highest
+    prefer-hd          best rendition of at least 720p, else highest
+    max-bitrate=KBPS   highest rendition at or below KBPS kbit/s, else lowest
+"""
+
+import logging
+import re
+
+from .feed import is_video_mime_type, is_video_url
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ('first', 'highest', 'lowest', 'prefer-hls', 'prefer-hd', 'max-bitrate=KBPS')
+
+HD_HEIGHT = 720
+
+RESOLUTION_RE = re.compile(r'(?<![0-9])(2160|1440|1080|720|576|540|480|360|288|270|240)p', re.IGNORECASE)
+BITRATE_RE = re.compile(r'(?<![0-9])([0-9]{3,5})k(?:bps)?(?![a-z])', re.IGNORECASE)
+
+# Quality markers used by German public broadcasters' CDNs, mapped to a rough height.
+# They are matched against the file name only; the single letters must also
+# end its stem (video_l.mp4, video.s.mp4), since "_s_" or ".m." turn up in
+# plenty of unrelated names.
+STEM_END = r'(?:\.[a-z0-9]+)?$'
+URL_MARKERS = (
+    (re.compile(r'[_.](?:webxxl|xxl|hd)[_.]', re.IGNORECASE), 1080),
+    (re.compile(r'[_.](?:webxl|xl)[_.]', re.IGNORECASE), 720),
+    (re.compile(r'[_.](?:webl[_.]|l' + STEM_END + ')', re.IGNORECASE), 540),
+    (re.compile(r'[_.](?:webm[_.]|m' + STEM_END + ')', re.IGNORECASE), 360),
+    (re.compile(r'[_.](?:webs[_.]|s' + STEM_END + ')', re.IGNORECASE), 270),
+)
+
+
+def parse_policy(policy):
+    """Validate a policy string, return (name, argument)"""
+    policy = (policy or 'first').strip().lower()
+    if policy.startswith('max-bitrate='):
+        try:
+            return 'max-bitrate', int(policy.split('=', 1)[1])
+        except ValueError:
+            raise ValueError(f"Invalid bitrate in rendition policy: {policy}")
+    if policy in POLICIES:
+        return policy, None
+    raise ValueError(f"Unknown rendition policy: {policy} (choose from {', '.join(POLICIES)})")
+
+
+def _int(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _candidate(url, source, mime_type=None, bitrate=None, width=None, height=None, filesize=None):
+    """Build a rendition record, filling gaps from URL quality markers"""
+    bitrate = _int(bitrate)
+    height = _int(height)
+    base_url = url.split('?')[0]
+
+    if height is None:
+        match = RESOLUTION_RE.search(base_url)
+        if match:
+            height = int(match.group(1))
+    if height is None:
+        filename = base_url.rsplit('/', 1)[-1]
+        for marker, marker_height in URL_MARKERS:
+            if marker.search(filename):
+                height = marker_height
+                break
+    if bitrate is None:
+        match = BITRATE_RE.search(base_url)
+        if match:
+            bitrate = int(match.group(1))
+
+    return {
+        'url': url,
+        'source': source,
+        'type': mime_type,
+        'bitrate': bitrate,
+        'width': _int(width),
+        'height': height,
+        'filesize': _int(filesize),
+        'hls': base_url.lower().endswith('.m3u8') or (mime_type or '').lower() in (
+            'application/x-mpegurl', 'application/vnd.apple.mpegurl'),
+    }
+
+
+def collect_renditions(entry):
+    """Collect every video URL of an entry with its declared quality hints"""
+    candidates = []
+    seen = set()
+
+    def add(url, source, **hints):
+        if url and url not in seen:
+            seen.add(url)
+            candidates.append(_candidate(url, source, **hints))
+
+    for media in entry.get('media_content') or []:
+        if is_video_mime_type(media.get('type')) or media.get('medium') == 'video' or is_video_url(media.get('url')):
+            add(media.get('url'), 'media_content', mime_type=media.get('type'),
+                bitrate=media.get('bitrate'), width=media.get('width'),
+                height=media.get('height'), filesize=media.get('filesize'))
+
+    for enclosure in entry.get('enclosures') or []:
+        if is_video_mime_type(enclosure.get('type')) or is_video_url(enclosure.get('href')):
+            add(enclosure.get('href'), 'enclosure', mime_type=enclosure.get('type'),
+                filesize=enclosure.get('length'))
+
+    for link in entry.get('links') or []:
+        if is_video_mime_type(link.get('type')) or is_video_url(link.get('href')):
+            add(link.get('href'), 'link', mime_type=link.get('type'), filesize=link.get('length'))
+
+    if is_video_url(entry.get('link')):
+        add(entry.get('link'), 'direct_link')
+
+    return candidates
+
+
+def effective_bitrate(candidate):
+    """Declared bitrate in kbit/s, else a rough estimate from the resolution"""
+    if candidate['bitrate']:
+        return candidate['bitrate']
+    if candidate['height']:
+        return candidate['height'] * candidate['height'] * 9 // 2000
+    return 0
+
+
+def quality_key(candidate):
+    """Sort key: (estimated) bitrate, then resolution, then file size"""
+    return (
+        effective_bitrate(candidate),
+        candidate['height'] or 0,
+        candidate['width'] or 0,
+        candidate['filesize'] or 0,
+    )
+
+
+def has_quality_hints(candidate):
+    return any(quality_key(candidate))
+
+
+def rank_renditions(candidates, policy):
+    """Order candidates best-first for a policy (see module docstring)"""
+    name, argument = parse_policy(policy)
+    if name == 'first':
+        return list(candidates)
+
+    # Candidates without any quality hint (e.g. an HLS master playlist) keep
+    # their feed order behind the ones that can be compared
+    known = [c for c in candidates if has_quality_hints(c)]
+    unknown = [c for c in candidates if not has_quality_hints(c)]
+    by_quality = sorted(known, key=quality_key, reverse=True) + unknown
+    if name == 'highest':
+        return by_quality
+    if name == 'lowest':
+        return sorted(known, key=quality_key) + unknown
+    if name == 'prefer-hls':
+        return [c for c in by_quality if c['hls']] + [c for c in by_quality if not c['hls']]
+    if name == 'prefer-hd':
+        hd = [c for c in by_quality if (c['height'] or 0) >= HD_HEIGHT]
+        return hd + [c for c in by_quality if c not in hd]
+    if name == 'max-bitrate':
+        fitting = [c for c in known if effective_bitrate(c) <= argument]
+        too_high = [c for c in known if c not in fitting]
+        return sorted(fitting, key=quality_key, reverse=True) + sorted(too_high, key=quality_key) + unknown
+    return list(candidates)
+
+
+def rendition_label(candidate):
+    """Short human-readable quality label (e.g. '1080p', '3360k', 'HLS')"""
+    if candidate['height']:
+        return f"{candidate['height']}p"
+    if candidate['bitrate']:
+        return f"{candidate['bitrate']}k"
+    if candidate['hls']:
+        return "HLS"
+    return "fallback"
+
+
+def select_rendition(entry, default_url, policy, with_fallback=False):
+    """
+    Pick the video URL for an entry according to policy.
+
+    Returns (url, fallback) where fallback is a second, different candidate
+    (or None). With policy "first" and no fallback requested the strategy
+    result is returned untouched.
+    """
+    if parse_policy(policy)[0] == 'first' and not with_fallback:
+        return default_url, None
+
+    candidates = collect_renditions(entry)
+    if default_url and default_url not in {c['url'] for c in candidates}:
+        candidates.insert(0, _candidate(default_url, 'strategy'))
+    elif default_url:
+        # Keep the strategy result first so "first" stays stable
+        candidates.sort(key=lambda c: c['url'] != default_url)
+
+    ranked = rank_renditions(candidates, policy)
+    if not ranked:
+        return default_url, None
+
+    chosen = ranked[0]
+    if chosen['url'] != default_url:
+        logger.debug(f"✓ Rendition policy '{policy}' selected {rendition_label(chosen)}: {chosen['url']}")
+
+    fallback = None
+    if with_fallback and len(ranked) > 1:
+        fallback = ranked[1]
+    return chosen['url'], fallback
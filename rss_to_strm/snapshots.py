@@ -0,0 +1,221 @@
+"""
+Raw feed snapshots, change detection and offline replay.
+
+Every run tees the raw feed body into a snapshot file in the state
+directory while it streams in and hashes it (SHA-256). Many hosts send no
+ETag/Last-Modified, so the hash is what tells an unchanged feed apart:
+
+    - While the downloaded bytes still equal the last successful snapshot,
+      chunks are held back instead of being handed to the extractor.
+    - On the first differing byte the held part is replayed from the spool
+      file and the run continues as a normal streaming run.
+    - If the body ends identical (and the run configuration is unchanged),
+      FeedUnchanged is raised and nothing is processed or written.
+
+Snapshots are rotated (the newest `keep` are retained, plus the one the
+last successful run used) and can be fed back with `--replay`, which runs
+extraction and writing against a stored body without any network access.
+
+Snapshot files are shared by all libraries converting the same feed (the
+state directory is shared by libraries in the same parent directory), but
+the last success is recorded per library. A replay or a run without
+snapshots forgets it, because the library no longer matches it.
+
+Layout:
+    <state_dir>/snapshots/<feed key>/
+    ├── index.json                          (last successful hash/file/fingerprint per library)
+    ├── 20251014T201500-3f2a9c1b0d4e.xml
+    └── ...
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+from . import state
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEEP = 5
+INDEX_FILE = 'index.json'
+COMPARE_BLOCK = 64 * 1024
+
+
+class FeedUnchanged(Exception):
+    """The feed body and run configuration match the last successful run"""
+
+
+def feed_key(url):
+    """Stable directory name for a feed URL"""
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+
+
+def config_fingerprint(**options):
+    """Hash of the options that influence the output for a given body"""
+    payload = json.dumps(options, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class SnapshotStore:
+    """Snapshot directory of one feed"""
+
+    def __init__(self, state_dir, url, keep=DEFAULT_KEEP):
+        self.directory = os.path.join(state_dir, 'snapshots', feed_key(url))
+        self.url = url
+        self.keep = keep
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def last_success(self, library):
+        """{'hash', 'file', 'fingerprint', 'url', 'time', 'complete'} of library's last successful run, or None"""
+        index = state.load_json(self.index_path, {})
+        last = index.get('libraries', {}).get(os.path.abspath(library))
+        if last and os.path.exists(os.path.join(self.directory, last.get('file', ''))):
+            return last
+        return None
+
+    def snapshots(self):
+        """Snapshot file paths, newest first"""
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith('.xml')]
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, n) for n in sorted(names, reverse=True)]
+
+    def latest(self):
+        found = self.snapshots()
+        return found[0] if found else None
+
+    def recorder(self, previous=None):
+        """Start spooling a new body; previous is the snapshot path to compare against"""
+        state.ensure_dir(self.directory)
+        return SnapshotRecorder(self, previous)
+
+    def commit(self, recorder):
+        """Move a finished spool file into place and rotate old snapshots"""
+        suffix = '-' + recorder.digest[:12] + '.xml'
+        path = os.path.join(self.directory, time.strftime('%Y%m%dT%H%M%S') + suffix)
+        os.replace(recorder.spool_path, path)
+        # An identical body is stored only once, under its newest timestamp
+        for older in self.snapshots():
+            if older != path and older.endswith(suffix):
+                os.unlink(older)
+        recorder.path = path
+        self.rotate()
+        logger.debug(f"Stored feed snapshot: {path}")
+        return path
+
+    def mark_success(self, path, digest, fingerprint, library, complete=True):
+        index = state.load_json(self.index_path, {})
+        index.pop('last_success', None)  # pre per-library format
+        index.setdefault('libraries', {})[os.path.abspath(library)] = {
+            'file': os.path.basename(path),
+            'hash': digest,
+            'fingerprint': fingerprint,
+            'url': self.url,
+            'time': time.time(),
+            'complete': complete,
+        }
+        state.save_json(self.index_path, index)
+
+    def forget(self, library):
+        """Drop library's last success, e.g. after it was written from a replayed snapshot"""
+        index = state.load_json(self.index_path, {})
+        if index.get('libraries', {}).pop(os.path.abspath(library), None):
+            state.save_json(self.index_path, index)
+
+    def rotate(self):
+        index = state.load_json(self.index_path, {})
+        protected = {last.get('file') for last in index.get('libraries', {}).values()}
+        for path in self.snapshots()[self.keep:]:
+            if os.path.basename(path) not in protected:
+                try:
+                    os.unlink(path)
+                except OSError as e:
+                    logger.debug(f"Could not remove old snapshot {path}: {e}")
+
+
+class SnapshotRecorder:
+    """
+    Wraps the raw chunk stream: spools and hashes it, and holds chunks back
+    for as long as they match the previous snapshot byte for byte.
+    """
+
+    def __init__(self, store, previous=None):
+        self.store = store
+        fd, self.spool_path = tempfile.mkstemp(prefix='.spool-', suffix='.xml', dir=store.directory)
+        self.spool = os.fdopen(fd, 'wb')
+        self.hash = hashlib.sha256()
+        self.previous = open(previous, 'rb') if previous else None
+        self.size = 0
+        self.diverged = previous is None
+        self.digest = None
+        self.path = None
+
+    def _matches_previous(self, chunk):
+        other = self.previous.read(len(chunk))
+        return other == chunk
+
+    def _release_held(self):
+        """Yield the spooled bytes that were held back while matching"""
+        self.spool.flush()
+        with open(self.spool_path, 'rb') as held:
+            while True:
+                block = held.read(COMPARE_BLOCK)
+                if not block:
+                    break
+                yield block
+
+    def wrap(self, chunks):
+        """
+        Generator passing chunks through once they are known to differ.
+
+        Raises FeedUnchanged at the end when the body equals the previous
+        snapshot.
+        """
+        try:
+            for chunk in chunks:
+                self.spool.write(chunk)
+                self.hash.update(chunk)
+                self.size += len(chunk)
+                if self.diverged:
+                    yield chunk
+                elif not self._matches_previous(chunk):
+                    logger.debug(f"Feed differs from last snapshot after {self.size} bytes")
+                    self.diverged = True
+                    yield from self._release_held()
+
+            self.digest = self.hash.hexdigest()
+            if not self.diverged:
+                if not self.previous.read(1):
+                    raise FeedUnchanged(self.digest)
+                self.diverged = True
+                yield from self._release_held()
+        finally:
+            self.spool.close()
+            if self.previous:
+                self.previous.close()
+
+    def discard(self):
+        try:
+            os.unlink(self.spool_path)
+        except OSError:
+            pass
+
+
+def resolve_replay(target, state_dir, url):
+    """Turn a --replay argument ('latest' or a path) into an existing snapshot file"""
+    if target != 'latest':
+        # Never fall through to parsing the argument itself as a document
+        if not os.path.isfile(target):
+            raise FileNotFoundError(f"Snapshot file not found: {target}")
+        return target
+    latest = SnapshotStore(state_dir, url).latest()
+    if not latest:
+        raise FileNotFoundError(f"No snapshots stored for {url}")
+    return latest
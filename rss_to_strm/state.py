@@ -0,0 +1,56 @@
+"""
+Run state that must survive the temp-dir swap of the output library
+(probe caches, feed hashes, snapshots, locks).
+
+By default it lives in a hidden ".rss-to-strm" directory next to the output
+library, so it is on the same filesystem but never inside the tree that
+gets replaced on every run.
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR_NAME = '.rss-to-strm'
+
+
+def default_state_dir(output_library):
+    """Hidden state directory next to output_library"""
+    library = os.path.abspath(output_library.rstrip('/\\') or '.')
+    return os.path.join(os.path.dirname(library), STATE_DIR_NAME)
+
+
+def ensure_dir(path):
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def load_json(path, default=None):
+    """Read a JSON state file, returning default when missing or corrupt"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable state file {path}: {e}")
+        return default
+
+
+def save_json(path, data):
+    """Write a JSON state file atomically (temp file + rename)"""
+    directory = ensure_dir(os.path.dirname(path) or '.')
+    fd, temp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,363 @@
+"""
+WebSub (PubSubHubbub) subscriber mode.
+
+Instead of polling, the converter subscribes to the feed's hub and keeps
+running; the hub pushes new feed content to a small HTTP callback and
+every push is converted right away:
+
+    1. Run once normally, then discover the hub and topic from the HTTP
+       Link header or <atom:link rel="hub"/"self"> of the feed.
+    2. Start the callback server and subscribe (hub.mode=subscribe with a
+       random hub.secret). The hub verifies the intent with a GET carrying
+       hub.challenge, which is echoed back. The lease is renewed before
+       it runs out. Verifications and denials for another topic get 404.
+    3. Pushed bodies must carry a valid X-Hub-Signature (HMAC of the body
+       with the secret); others are acknowledged and ignored, as the spec
+       requires; bodies over MAX_PUSH_SIZE are refused with 413 unread.
+       A valid body goes into pipeline.run(body=...), so it passes
+       through the normal extraction, snapshot, lock and swap path.
+
+Hubs may push the full feed or only the new entries. With payload='auto'
+a push is used directly when it has at least as many entries as the
+current library; smaller pushes only trigger a regular fetch of the feed
+so a partial payload never replaces the library ('full' / 'fetch' force
+either behaviour). Index outputs (see index.py) always fetch under 'auto'.
+
+Feeds without a hub (or whose hub refuses the subscription) fall back to
+polling every poll_interval seconds; with a hub the same interval is a
+safety-net poll for missed pushes. See websub_demo_hub.py for a local
+stand-in hub.
+"""
+
+import hmac
+import logging
+import queue
+import re
+import threading
+import time
+
+from . import net
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LISTEN = '0.0.0.0:8085'
+DEFAULT_POLL_INTERVAL = 3600
+DEFAULT_LEASE = 10 * 86400
+RENEW_BEFORE = 0.2              # renew when less than 20 % of the lease is left
+VERIFY_TIMEOUT = 30
+RENEW_RETRY = 300
+MAX_PUSH_SIZE = 32 * 1024 * 1024  # larger pushes are refused with 413
+PAYLOADS = ('auto', 'full', 'fetch')
+SIGNATURE_METHODS = ('sha1', 'sha256', 'sha384', 'sha512')
+
+LINK_HEADER_RE = re.compile(r'<([^>]+)>\s*;\s*rel="?([^";]+)"?')
+
+
+def discover(url):
+    """Return (hub, topic) of a feed; hub is None when the feed announces none"""
+    import feedparser
+    from .fetch import iter_feed_chunks
+
+    links = []
+    if url.lower().startswith(('http://', 'https://')):
+        with net.urlopen(url) as response:
+            body = response.read()
+            links = response.headers.get_all('Link') or []
+    else:
+        body = b''.join(iter_feed_chunks(url))
+
+    hub = topic = None
+    for value in links:
+        for href, rels in LINK_HEADER_RE.findall(value):
+            rels = rels.lower().split()
+            if 'hub' in rels and not hub:
+                hub = href
+            if 'self' in rels and not topic:
+                topic = href
+
+    if not hub or not topic:
+        for link in feedparser.parse(body).feed.get('links', []):
+            if link.get('rel') == 'hub' and not hub:
+                hub = link.get('href')
+            elif link.get('rel') == 'self' and not topic:
+                topic = link.get('href')
+
+    return hub, topic or url
+
+
+def verify_signature(secret, body, header):
+    """Check an X-Hub-Signature header ("sha256=<hex>") against the body"""
+    if not header or '=' not in header:
+        return False
+    method, _, signature = header.partition('=')
+    method = method.strip().lower()
+    if method not in SIGNATURE_METHODS:
+        return False
+    expected = hmac.new(secret.encode('utf-8'), body, method).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
+
+
+def _parse_listen(listen):
+    host, _, port = listen.rpartition(':')
+    return host or '0.0.0.0', int(port)
+
+
+def _make_handler(subscriber):
+    from http.server import BaseHTTPRequestHandler
+    from urllib.parse import parse_qs, urlsplit
+
+    class CallbackHandler(BaseHTTPRequestHandler):
+        def _reply(self, status, body=b''):
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            """Intent verification: echo hub.challenge for the subscription we asked for"""
+            url = urlsplit(self.path)
+            if url.path != subscriber.callback_path:
+                return self._reply(404)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            mode = params.get('hub.mode')
+            if params.get('hub.topic') != subscriber.topic:
+                return self._reply(404)
+            # Hubs may deny a subscription at any time, not only while one is pending
+            if mode == 'denied':
+                logger.warning(f"WebSub hub denied the subscription: {params.get('hub.reason', 'no reason given')}")
+                subscriber.denied()
+                return self._reply(200)
+            challenge = params.get('hub.challenge')
+            if not challenge or mode != subscriber.pending_mode:
+                return self._reply(404)
+            subscriber.verified(mode, params.get('hub.lease_seconds'))
+            self._reply(200, challenge.encode('utf-8'))
+
+        def do_POST(self):
+            """Content distribution: accept signed pushes, ignore everything else"""
+            if urlsplit(self.path).path != subscriber.callback_path:
+                return self._reply(404)
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+            except ValueError:
+                length = -1
+            if not 0 <= length <= MAX_PUSH_SIZE:
+                logger.warning(f"Refusing WebSub push with Content-Length {self.headers.get('Content-Length')}")
+                # The body is not read, so the connection cannot be reused
+                self.close_connection = True
+                return self._reply(400 if length < 0 else 413)
+            body = self.rfile.read(length)
+            if verify_signature(subscriber.secret, body, self.headers.get('X-Hub-Signature')):
+                subscriber.received(body)
+            else:
+                logger.warning("Ignoring WebSub push with missing or invalid signature")
+            # 2xx either way, so a forged request learns nothing
+            self._reply(202)
+
+        def log_message(self, format, *args):
+            logger.debug(f"WebSub callback: {self.address_string()} {format % args}")
+
+    return CallbackHandler
+
+
+class Subscriber:
+    """Callback server plus subscription state for one topic"""
+
+    def __init__(self, hub, topic, callback_url, listen=DEFAULT_LISTEN, secret=None, lease_seconds=DEFAULT_LEASE):
+        import secrets
+        from urllib.parse import urlsplit
+
+        self.hub = hub
+        self.topic = topic
+        self.callback_url = callback_url
+        self.callback_path = urlsplit(callback_url).path or '/'
+        self.listen = _parse_listen(listen)
+        self.secret = secret or secrets.token_hex(20)
+        self.lease_seconds = lease_seconds
+        self.granted_lease = None
+        self.lease_expires = None
+        self.pending_mode = None
+        self.answered = threading.Event()
+        self.accepted = False
+        self.pushes = queue.Queue()
+        self.server = None
+
+    def start(self):
+        from http.server import ThreadingHTTPServer
+
+        self.server = ThreadingHTTPServer(self.listen, _make_handler(self))
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='rss-to-strm-websub', daemon=True).start()
+        logger.info(f"WebSub callback listening on {self.listen[0]}:{self.listen[1]} ({self.callback_url})")
+
+    def _request(self, mode):
+        from urllib.parse import urlencode
+
+        data = urlencode({
+            'hub.mode': mode,
+            'hub.topic': self.topic,
+            'hub.callback': self.callback_url,
+            'hub.secret': self.secret,
+            'hub.lease_seconds': self.lease_seconds,
+        }).encode('ascii')
+        with net.urlopen(self.hub, method='POST', data=data,
+                         headers={'Content-Type': 'application/x-www-form-urlencoded'}) as response:
+            return response.status
+
+    def subscribe(self, timeout=VERIFY_TIMEOUT):
+        """Ask the hub for a subscription and wait for its verification; returns True on success"""
+        self.pending_mode = 'subscribe'
+        self.answered.clear()
+        self.accepted = False
+        try:
+            status = self._request('subscribe')
+        except Exception as e:
+            logger.warning(f"WebSub subscription request to {self.hub} failed: {e}")
+            return False
+        logger.info(f"WebSub subscription requested at {self.hub} (HTTP {status}) for {self.topic}")
+        if not self.answered.wait(timeout):
+            logger.warning(f"WebSub hub did not verify the subscription within {timeout} s")
+            return False
+        return self.accepted
+
+    def unsubscribe(self):
+        self.pending_mode = 'unsubscribe'
+        try:
+            self._request('unsubscribe')
+        except Exception as e:
+            logger.debug(f"WebSub unsubscribe failed: {e}")
+
+    def verified(self, mode, lease_seconds):
+        if mode == 'subscribe':
+            lease = int(lease_seconds) if lease_seconds and lease_seconds.isdigit() else self.lease_seconds
+            self.granted_lease = lease
+            self.lease_expires = time.time() + lease
+            logger.info(f"✓ WebSub subscription verified (lease {lease} s)")
+        self.accepted = True
+        self.answered.set()
+
+    def denied(self):
+        self.lease_expires = None
+        self.accepted = False
+        self.answered.set()
+
+    def needs_renewal(self):
+        if self.lease_expires is None:
+            return True
+        # Hubs may grant a shorter lease than requested
+        return time.time() > self.lease_expires - self.granted_lease * RENEW_BEFORE
+
+    def received(self, body):
+        logger.info(f"WebSub push received ({len(body)} bytes)")
+        self.pushes.put(body)
+
+    def next_push(self, timeout):
+        """Latest pushed body within timeout (older queued pushes are superseded), or None"""
+        try:
+            body = self.pushes.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        while True:
+            try:
+                body = self.pushes.get_nowait()
+            except queue.Empty:
+                return body
+
+    def close(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def looks_complete(body, output_library):
+    """True if a pushed body has at least as many entries as the current library"""
+    from .fetch import ENTRY_START_RE
+    from .manifest import Manifest
+
+    entries = len(ENTRY_START_RE.findall(body))
+    current = len(Manifest.load(output_library).items)
+    return entries > 0 and entries >= current
+
+
+def default_callback(listen, rssurl):
+    import socket
+    from .snapshots import feed_key
+
+    host, port = _parse_listen(listen)
+    if host in ('', '0.0.0.0', '::'):
+        host = socket.getfqdn()
+    return f"http://{host}:{port}/websub/{feed_key(rssurl)}"
+
+
+def serve(rssurl, output_library, run_options=None, hub=None, callback_url=None, listen=DEFAULT_LISTEN,
+          secret=None, poll_interval=DEFAULT_POLL_INTERVAL, payload='auto', stop=None):
+    """
+    Convert rssurl once, then keep it current from WebSub pushes (or by
+    polling when no hub is available) until stop is set or Ctrl+C.
+    """
+    from .pipeline import run
+
+    run_options = dict(run_options or {})
+    stop = stop or threading.Event()
+    if payload == 'auto' and run_options.get('output_format', 'folders') != 'folders':
+        # Index files have no manifest to compare a push against
+        payload = 'fetch'
+
+    def convert(body=None):
+        return run(rssurl, output_library, body=body, **run_options)
+
+    convert()
+
+    topic = rssurl
+    if not hub:
+        try:
+            hub, topic = discover(rssurl)
+        except Exception as e:
+            logger.warning(f"WebSub hub discovery failed: {e}")
+
+    subscriber = None
+    if hub:
+        subscriber = Subscriber(hub, topic, callback_url or default_callback(listen, rssurl),
+                                listen=listen, secret=secret)
+        subscriber.start()
+        if not subscriber.subscribe():
+            logger.warning("WebSub subscription failed - falling back to polling")
+            subscriber.close()
+            subscriber = None
+    else:
+        logger.info("Feed announces no WebSub hub - falling back to polling")
+
+    logger.info(f"Waiting for updates (poll every {poll_interval} s{', push enabled' if subscriber else ''})")
+    last_poll = time.monotonic()
+    next_renewal = 0.0
+    try:
+        while not stop.is_set():
+            wait = max(0.0, min(60.0, poll_interval - (time.monotonic() - last_poll)))
+            body = None
+            if subscriber:
+                if subscriber.needs_renewal() and time.monotonic() >= next_renewal:
+                    if not subscriber.subscribe():
+                        logger.warning(f"WebSub subscription renewal failed - retrying in {RENEW_RETRY} s")
+                        next_renewal = time.monotonic() + RENEW_RETRY
+                body = subscriber.next_push(wait)
+            else:
+                stop.wait(wait)
+
+            if body is not None:
+                if payload == 'full' or (payload == 'auto' and looks_complete(body, output_library)):
+                    convert(body)
+                else:
+                    logger.info("Pushed content looks partial - fetching the full feed")
+                    convert()
+                last_poll = time.monotonic()
+            elif time.monotonic() - last_poll >= poll_interval:
+                convert()
+                last_poll = time.monotonic()
+    except KeyboardInterrupt:
+        logger.info("Stopping WebSub subscriber")
+    finally:
+        if subscriber:
+            subscriber.unsubscribe()
+            subscriber.close()
+    return 0
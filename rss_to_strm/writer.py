@@ -0,0 +1,349 @@
+"""
+STRM/NFO/thumbnail writer.
+
+Output Structure:
+    <library>/
+    ├── .blobs/              (thumbnail content store, see blobs.py)
+    ├── Title 1/
+    │   ├── Title 1.strm
+    │   ├── Title 1.nfo
+    │   └── Title 1-thumb.jpg     (referenced by the NFO's <thumb>/<cover>)
+    └── ...
+
+The item folder can be nested deeper with a layout (see layout.py), e.g.
+<library>/<show>/Season <year>/<title>/ for very large libraries.
+"""
+
+import logging
+import os
+import shutil
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+
+
+#function to normalize the name to remove invalid chars for file names
+def normalize_filename(str):
+    bad_chars = '<>:"/\\|?*'
+    for char in bad_chars:
+        str = str.replace(char, '')
+    return str
+
+
+def create_nfo_xml(metadata, local_thumbnail=None, season=None):
+    """
+    Create NFO XML content for Jellyfin/Kodi metadata with namespace-aware fields.
+
+    local_thumbnail is the file name of the downloaded thumbnail next to the
+    NFO; it replaces the remote URL in <thumb>/<cover> so media servers load
+    the artwork locally. season is the number of the item's season folder
+    (see layout.item_season); without one every item is in season 1.
+    """
+    import xml.etree.ElementTree as ET
+
+    root = ET.Element('episodedetails')
+
+    # Title
+    title_elem = ET.SubElement(root, 'title')
+    title_elem.text = metadata.get('title', 'Unknown')
+
+    # Aired date (for chronological sorting)
+    if metadata.get('aired'):
+        aired_elem = ET.SubElement(root, 'aired')
+        aired_elem.text = metadata['aired']
+
+    # Plot/Description (from content:encoded or summary)
+    if metadata.get('summary'):
+        plot_elem = ET.SubElement(root, 'plot')
+        plot_elem.text = metadata['summary']
+
+    # Director/Author (from dc:creator or author field)
+    if metadata.get('author'):
+        director_elem = ET.SubElement(root, 'director')
+        director_elem.text = metadata['author']
+
+    # Genre/Tags (from category or tags)
+    if metadata.get('tags'):
+        for tag in metadata['tags']:
+            genre_elem = ET.SubElement(root, 'genre')
+            genre_elem.text = tag
+
+    # Stream failed the liveness check (see liveness.py)
+    if metadata.get('offline'):
+        tag_elem = ET.SubElement(root, 'tag')
+        tag_elem.text = 'offline'
+
+    # Duration (from Media RSS namespace)
+    if metadata.get('duration'):
+        runtime_elem = ET.SubElement(root, 'runtime')
+        runtime_elem.text = metadata['duration']
+
+    # Thumbnail/Cover image: the local copy if it was downloaded, else the remote URL
+    thumbnail = local_thumbnail or metadata.get('thumbnail')
+    if thumbnail:
+        thumb_elem = ET.SubElement(root, 'thumb')
+        thumb_elem.text = thumbnail
+        # Also add as cover (Jellyfin compatibility)
+        cover_elem = ET.SubElement(root, 'cover')
+        cover_elem.text = thumbnail
+
+    # Season of the layout's season folder, else generic season/episode info for organization
+    season_elem = ET.SubElement(root, 'season')
+    season_elem.text = str(1 if season is None else season)
+
+    episode_elem = ET.SubElement(root, 'episode')
+    episode_elem.text = '1'
+
+    # Indent for readability
+    ET.indent(root, space='  ')
+
+    return ET.tostring(root, encoding='unicode')
+
+
+def write_nfo(item_nfo, metadata, local_thumbnail=None, season=None):
+    """Write an NFO file (see create_nfo_xml)"""
+    logger.info(f"Creating NFO file: {item_nfo}")
+    nfo_content = create_nfo_xml(metadata, local_thumbnail, season)
+    with open(item_nfo, "w", encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(nfo_content)
+
+
+def thumbnail_extension(thumbnail_url):
+    """Pick a file extension for a thumbnail URL (defaults to .jpg)"""
+    lower_url = thumbnail_url.lower()
+    if lower_url.endswith(('.jpg', '.jpeg')):
+        return ".jpg"
+    for ext in ('.png', '.webp', '.gif'):
+        if lower_url.endswith(ext):
+            return ext
+
+    # Try to extract from URL without query parameters
+    if '?' in thumbnail_url:
+        base_url = thumbnail_url.split('?')[0]
+        if base_url.lower().endswith(THUMBNAIL_EXTENSIONS):
+            ext = base_url.split('.')[-1]
+            logger.debug(f"✓ Extracted extension from URL base: {ext}")
+            return "." + ext
+
+    # If still no extension, default to jpg
+    return ".jpg"
+
+
+def download_thumbnail(thumbnail_url, item_thumb):
+    """Download a thumbnail to item_thumb, return True on success"""
+    from . import net
+
+    try:
+        logger.info(f"Downloading thumbnail: {item_thumb}")
+        thumbnail_data = net.fetch_bytes(thumbnail_url)
+
+        with open(item_thumb, 'wb') as f:
+            f.write(thumbnail_data)
+
+        logger.debug(f"✓ Thumbnail saved: {os.path.basename(item_thumb)}")
+        return True
+
+    except Exception as e:
+        logger.warning(f"Could not download thumbnail: {e}")
+        logger.debug(f"  URL: {thumbnail_url}")
+        return False
+
+
+def store_thumbnail(blobs, thumbnail_url, item_thumb, reuse_thumbnail=None):
+    """
+    Put a thumbnail into the blob store and link it to item_thumb.
+
+    reuse_thumbnail (a file from the previous library) is stored instead of
+    downloading. Returns item_thumb on success, else None.
+    """
+    from . import net
+    from .blobs import link_file
+
+    ext = os.path.splitext(item_thumb)[1]
+    blob = None
+    if reuse_thumbnail:
+        try:
+            blob = blobs.put_file(reuse_thumbnail, ext)
+            logger.debug(f"✓ Thumbnail reused from previous run: {os.path.basename(item_thumb)}")
+        except OSError as e:
+            logger.debug(f"Could not reuse thumbnail {reuse_thumbnail}: {e}")
+
+    if blob is None:
+        try:
+            logger.info(f"Downloading thumbnail: {item_thumb}")
+            blob = blobs.fetch(thumbnail_url, ext, net.fetch_bytes)
+        except Exception as e:
+            logger.warning(f"Could not download thumbnail: {e}")
+            logger.debug(f"  URL: {thumbnail_url}")
+            return None
+        if blob is None:
+            logger.debug(f"Skipping thumbnail whose download already failed: {thumbnail_url}")
+            return None
+
+    method = link_file(blob, item_thumb)
+    logger.debug(f"✓ Thumbnail saved ({method}): {os.path.basename(item_thumb)}")
+    return item_thumb
+
+
+def write_item(item_title, item_data, library, download_thumbnails=True, item_dir=None, reuse_thumbnail=None,
+               blobs=None, thumbnail=True, season=None):
+    """
+    Write the .strm, .nfo and thumbnail for one item below library.
+
+    item_dir is the item folder relative to library (default: the
+    normalised title). reuse_thumbnail is an existing copy of the thumbnail
+    that is linked or copied instead of downloading it again. With a
+    BlobStore (see blobs.py) identical thumbnails are stored only once and
+    the item thumbnail is a link to the shared blob.
+
+    The thumbnail is saved as "<name>-thumb.<ext>" and the NFO is written
+    once its outcome is known, so it references the local file (or the
+    remote URL if the download failed). With download_thumbnails=False the
+    download and the NFO are not written yet but returned as a callable,
+    so the caller can run them concurrently. The callable returns the
+    thumbnail path on success, else None. thumbnail=False skips the
+    thumbnail and writes the NFO with the remote URL right away. season is
+    written to the NFO (see create_nfo_xml).
+    """
+    video_url = item_data['url']
+    metadata = item_data['metadata']
+
+    name = normalize_filename(item_title)
+    item_path = os.path.join(library, item_dir or name)
+    item_strm = os.path.join(item_path, name + ".strm")
+    item_nfo = os.path.join(item_path, name + ".nfo")
+
+    if not os.path.exists(item_path):
+        logger.debug(f"Creating item directory: {item_path}")
+        os.makedirs(item_path, exist_ok=True)
+
+    # Write STRM file (URL pointer)
+    logger.info(f"Creating STRM file: {item_strm}")
+    with open(item_strm, "w") as f:
+        f.write(video_url)
+
+    # Write fallback rendition as a second version ("<name> - 720p.strm")
+    fallback = item_data.get('fallback')
+    if fallback:
+        from .renditions import rendition_label
+        label = normalize_filename(rendition_label(fallback))
+        fallback_strm = os.path.join(item_path, f"{name} - {label}.strm")
+        logger.info(f"Creating fallback STRM file: {fallback_strm}")
+        with open(fallback_strm, "w") as f:
+            f.write(fallback['url'])
+
+    # Without a thumbnail to fetch, write the NFO file right away
+    if not metadata.get('thumbnail') or not thumbnail:
+        write_nfo(item_nfo, metadata, season=season)
+        return None
+
+    thumbnail_url = metadata['thumbnail']
+    item_thumb = os.path.join(item_path, name + "-thumb" + thumbnail_extension(thumbnail_url))
+
+    def fetch_thumbnail():
+        if blobs is not None:
+            return store_thumbnail(blobs, thumbnail_url, item_thumb, reuse_thumbnail)
+        if reuse_thumbnail:
+            from .blobs import link_file
+            try:
+                link_file(reuse_thumbnail, item_thumb)
+                logger.debug(f"✓ Thumbnail reused from previous run: {os.path.basename(item_thumb)}")
+                return item_thumb
+            except OSError as e:
+                logger.debug(f"Could not reuse thumbnail {reuse_thumbnail}: {e}")
+        return item_thumb if download_thumbnail(thumbnail_url, item_thumb) else None
+
+    def thumbnail_and_nfo():
+        path = None
+        try:
+            path = fetch_thumbnail()
+        except Exception as e:
+            logger.warning(f"Could not save thumbnail {item_thumb}: {e}")
+        finally:
+            # NFO file (metadata for chronological sorting) pointing at the local thumbnail
+            write_nfo(item_nfo, metadata, os.path.basename(path) if path else None, season)
+        return path
+
+    if download_thumbnails:
+        thumbnail_and_nfo()
+        return None
+    return thumbnail_and_nfo
+
+
+class LibraryWriter:
+    """
+    Writes items into a library using a layout and records a manifest.
+
+    previous is the Manifest of the library being replaced; thumbnails it
+    already holds for the same URL are reused instead of re-downloaded.
+    Thumbnails go through a content-addressed BlobStore in the library.
+    """
+
+    def __init__(self, library, layout=None, previous=None):
+        from .blobs import BlobStore
+        from .layout import resolve_layout
+        from .manifest import Manifest
+
+        self.library = library
+        self.template = resolve_layout(layout)
+        self.manifest = Manifest(library)
+        self.previous = previous or Manifest(None)
+        self.blobs = BlobStore(library)
+        self.reused = 0
+        self.missing = 0    # thumbnails that could not be saved
+
+    def write(self, item_title, item_data, download_thumbnails=True):
+        """
+        Write one item, return its thumbnail job (or None).
+
+        Without download_thumbnails only a reusable previous thumbnail is
+        carried over. A title that was already written is replaced (the
+        later feed entry wins); the caller must have finished the earlier
+        item's thumbnail job.
+        """
+        from .layout import item_parts, item_season
+
+        earlier = self.manifest.forget(item_title)
+        if earlier:
+            logger.info(f"Duplicate title, keeping the later entry: {item_title}")
+            shutil.rmtree(os.path.join(self.library, earlier['path']), ignore_errors=True)
+
+        metadata = item_data['metadata']
+        item_dir = os.path.join(*item_parts(self.template, item_title, metadata))
+        thumbnail_url = metadata.get('thumbnail')
+        reuse = self.previous.reusable_thumbnail(item_title, thumbnail_url) if thumbnail_url else None
+
+        job = write_item(item_title, item_data, self.library, download_thumbnails=False,
+                         item_dir=item_dir, reuse_thumbnail=reuse, blobs=self.blobs,
+                         thumbnail=bool(download_thumbnails or reuse),
+                         season=item_season(self.template, item_title, metadata))
+        self.manifest.record(item_title, path=item_dir, url=item_data['url'], thumbnail_url=thumbnail_url)
+        if not job:
+            return None
+
+        def record_thumbnail():
+            path = job()
+            if path:
+                self.manifest.record(item_title, thumbnail=os.path.relpath(path, self.library))
+                if reuse:
+                    with self.manifest.lock:
+                        self.reused += 1
+            else:
+                with self.manifest.lock:
+                    self.missing += 1
+            return path
+        return record_thumbnail
+
+    def close(self):
+        self.manifest.save()
+
+
+#create directories and write out strm and nfo files
+def write_strm_files(video_dict, temp_output_library):
+    """Write every item of a get_feed() dict; thumbnails download concurrently"""
+    from .pipeline import write_items
+
+    logger.info(f"Processing {len(video_dict)} items")
+    write_items(video_dict.items(), temp_output_library)
@@ -0,0 +1,31 @@
+import os
+
+from rss_to_strm.blobs import BlobStore, link_file
+
+
+def test_relinking_existing_target_keeps_blob(tmp_path):
+    blobs = BlobStore(str(tmp_path))
+    blob = blobs.put_bytes(b'artwork', '.jpg')
+    target = str(tmp_path / 'Show-thumb.jpg')
+
+    link_file(blob, target)
+    assert link_file(blob, target) == 'existing'
+
+    with open(blob, 'rb') as f:
+        assert f.read() == b'artwork'
+
+
+def test_link_replaces_other_content(tmp_path):
+    blobs = BlobStore(str(tmp_path))
+    old = blobs.put_bytes(b'old', '.jpg')
+    new = blobs.put_bytes(b'new', '.jpg')
+    target = str(tmp_path / 'Show-thumb.jpg')
+
+    link_file(old, target)
+    link_file(new, target)
+
+    with open(target, 'rb') as f:
+        assert f.read() == b'new'
+    with open(old, 'rb') as f:
+        assert f.read() == b'old'
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
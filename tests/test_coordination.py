@@ -0,0 +1,42 @@
+import os
+
+from rss_to_strm.coordination import WorkQueue
+
+
+def test_work_requeues_skipped_jobs(tmp_path):
+    queue = WorkQueue(str(tmp_path))
+    for feed in ('a', 'b', 'c'):
+        queue.enqueue({'rssurl': feed})
+
+    results = {'a': True, 'b': False, 'c': None}
+    seen = []
+
+    def process(job):
+        seen.append(job['rssurl'])
+        return results[job['rssurl']]
+
+    assert queue.work(process) == (1, 1, 1)
+    assert sorted(seen) == ['a', 'b', 'c']
+    assert len(os.listdir(tmp_path / 'pending')) == 1
+    assert len(os.listdir(tmp_path / 'done')) == 1
+    assert len(os.listdir(tmp_path / 'failed')) == 1
+    assert not os.listdir(tmp_path / 'claimed')
+
+
+def test_enqueue_stores_absolute_paths(tmp_path, monkeypatch):
+    import json
+
+    from rss_to_strm.cli import main
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'feed.xml').write_bytes(b'<rss/>')
+    assert main(['feed.xml', 'library', '', '--enqueue', str(tmp_path / 'q'),
+                 '--state-dir', 'state', '--replay', 'snap.xml']) == 0
+
+    [name] = os.listdir(tmp_path / 'q' / 'pending')
+    with open(tmp_path / 'q' / 'pending' / name) as f:
+        job = json.load(f)
+    assert job['rssurl'] == str(tmp_path / 'feed.xml')
+    assert job['output_library'] == str(tmp_path / 'library')
+    assert job['state_dir'] == str(tmp_path / 'state')
+    assert job['replay'] == str(tmp_path / 'snap.xml')
@@ -0,0 +1,16 @@
+from rss_to_strm.feed import get_feed
+
+FEED = ('<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>'
+        '<item><title>Show - 1</title><enclosure url="http://x/1.mp4" type="video/mp4"/></item>'
+        '</channel></rss>')
+
+
+def test_get_feed_accepts_raw_bytes():
+    items = get_feed(FEED.encode('utf-8'))
+    assert items['Show']['url'] == 'http://x/1.mp4'
+
+
+def test_get_feed_accepts_raw_text_and_files(tmp_path):
+    path = tmp_path / 'feed.xml'
+    path.write_text(FEED)
+    assert get_feed(FEED) == get_feed(str(path))
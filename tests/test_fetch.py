@@ -0,0 +1,35 @@
+import feedparser
+
+from rss_to_strm.fetch import EntrySplitter, split_documents
+
+FEED = (b'<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>'
+        b'<item><title>A</title><description><![CDATA[ends with </item> here]]></description></item>'
+        b'<!-- </item> --><item><title>B</title></item>'
+        b'<item><title>C</title></item>'
+        b'</channel></rss>')
+
+
+def _titles(documents):
+    return [entry.title for document in documents for entry in feedparser.parse(document).entries]
+
+
+def test_split_matches_whole_document():
+    assert _titles(split_documents([FEED])) == _titles([FEED]) == ['A', 'B', 'C']
+
+
+def test_split_across_chunk_boundaries():
+    for size in (1, 7, 64):
+        chunks = [FEED[i:i + size] for i in range(0, len(FEED), size)]
+        assert _titles(split_documents(chunks)) == ['A', 'B', 'C'], size
+
+
+def test_cdata_end_tag_waits_for_more_data():
+    splitter = EntrySplitter()
+    cut = FEED.index(b'here')
+    assert _titles(splitter.feed(FEED[:cut])) == []
+    assert _titles(splitter.feed(FEED[cut:])) == ['A', 'B', 'C']
+
+
+def test_unsplittable_body_is_passed_through():
+    body = b'<html><body>not a feed</body></html>'
+    assert list(split_documents([body])) == [body]
@@ -0,0 +1,36 @@
+import json
+import os
+
+from rss_to_strm.index import write_index
+
+
+def _items(*pairs):
+    return [(title, {'url': url, 'metadata': {'duration': '1 min'}}) for title, url in pairs]
+
+
+def test_duplicate_titles_keep_last_entry(tmp_path):
+    path = str(tmp_path / 'index.ndjson')
+    items = _items(('Show', 'http://x/1.mp4'), ('Other', 'http://x/2.mp4'), ('Show', 'http://x/3.mp4'))
+
+    assert write_index(items, path, 'ndjson') == 2
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert [(r['title'], r['url']) for r in records] == [('Other', 'http://x/2.mp4'), ('Show', 'http://x/3.mp4')]
+
+
+def test_m3u_and_json_use_umask_permissions(tmp_path):
+    old = os.umask(0o022)
+    try:
+        for output_format, name in (('m3u', 'index.m3u8'), ('json', 'index.json')):
+            path = str(tmp_path / name)
+            write_index(_items(('A', 'http://x/1.mp4')), path, output_format, 'feed')
+            assert os.stat(path).st_mode & 0o777 == 0o644
+    finally:
+        os.umask(old)
+
+    with open(tmp_path / 'index.m3u8') as f:
+        assert f.read() == '#EXTM3U\n#EXTINF:60,A\nhttp://x/1.mp4\n'
+    with open(tmp_path / 'index.json') as f:
+        assert json.load(f) == {'feed': 'feed', 'items': [{'title': 'A', 'url': 'http://x/1.mp4',
+                                                            'metadata': {'duration': '1 min'}}]}
+    assert sorted(os.listdir(tmp_path)) == ['index.json', 'index.m3u8']
@@ -0,0 +1,40 @@
+import pytest
+
+from rss_to_strm.layout import PRESETS, item_parts, item_season, resolve_layout
+
+
+def test_presets_and_templates():
+    assert resolve_layout('show') == PRESETS['show']
+    assert resolve_layout('{shard}/{title}') == '{shard}/{title}'
+
+
+@pytest.mark.parametrize('layout', ['shows', '{show}', '{show}/Season {year}', '{bad}/{title}'])
+def test_invalid_layouts(layout):
+    with pytest.raises(ValueError):
+        resolve_layout(layout)
+
+
+def test_fields_cannot_add_levels():
+    parts = item_parts(resolve_layout('show'), 'A/B', {'author': '../x', 'aired': '2025-10-14'})
+    assert len(parts) == 3 and parts[1] == 'Season 2025'
+
+
+def test_season_follows_season_folder():
+    metadata = {'author': 'Show', 'aired': '2025-10-14'}
+    assert item_season(resolve_layout('show'), 'A', metadata) == 2025
+    assert item_season(resolve_layout('show'), 'A', {'author': 'Show'}) is None
+    assert item_season(resolve_layout('date'), 'A', metadata) is None
+    assert item_season('{show}/season {month}/{title}', 'A', metadata) == 10
+
+
+def test_nfo_season_matches_folder(tmp_path):
+    import xml.etree.ElementTree as ET
+
+    from rss_to_strm.writer import LibraryWriter
+
+    writer = LibraryWriter(str(tmp_path), layout='show')
+    writer.write('A', {'url': 'http://x/a.mp4', 'metadata': {'title': 'A', 'author': 'Show', 'aired': '2025-10-14'}})
+    writer.close()
+
+    root = ET.parse(tmp_path / 'Show' / 'Season 2025' / 'A' / 'A.nfo').getroot()
+    assert root.findtext('season') == '2025'
@@ -0,0 +1,75 @@
+import time
+
+from rss_to_strm.liveness import LivenessCache, LivenessChecker, validate_items
+from rss_to_strm.records import Item, Metadata
+
+
+def _result(alive, age=0):
+    return {'alive': alive, 'status': 200 if alive else 404, 'checked': time.time() - age}
+
+
+def _checker(results):
+    cache = LivenessCache()
+    for url, alive in results.items():
+        cache.put(url, _result(alive))
+    return LivenessChecker(cache, workers=2)
+
+
+def _item(url, fallback=None):
+    return Item(url, Metadata('title', source_url=url), {'url': fallback} if fallback else None)
+
+
+def test_cache_expires_after_ttl():
+    cache = LivenessCache(ttl=60)
+    cache.put('http://x/fresh.mp4', _result(True, age=30))
+    cache.put('http://x/old.mp4', _result(True, age=90))
+
+    assert cache.get('http://x/fresh.mp4')['alive']
+    assert cache.get('http://x/old.mp4') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_zero_ttl_never_reuses_results():
+    cache = LivenessCache(ttl=0)
+    cache.put('http://x/a.mp4', _result(True))
+    assert cache.get('http://x/a.mp4') is None
+
+
+def test_dead_urls_are_dropped_in_order():
+    checker = _checker({'http://x/a.mp4': True, 'http://x/b.mp4': False, 'http://x/c.mp4': True})
+    items = [(name, _item(f'http://x/{name}.mp4')) for name in 'abc']
+    try:
+        assert [title for title, item in validate_items(items, checker, window=1)] == ['a', 'c']
+    finally:
+        checker.pool.shutdown()
+
+
+def test_dead_urls_are_flagged():
+    checker = _checker({'http://x/a.mp4': False})
+    try:
+        [(title, item)] = validate_items([('a', _item('http://x/a.mp4'))], checker, action='flag')
+    finally:
+        checker.pool.shutdown()
+    assert item['metadata']['offline'] is True
+
+
+def test_live_fallback_is_promoted():
+    checker = _checker({'http://x/hd.mp4': False, 'http://x/sd.mp4': True})
+    try:
+        [(title, item)] = validate_items([('a', _item('http://x/hd.mp4', 'http://x/sd.mp4'))], checker)
+    finally:
+        checker.pool.shutdown()
+    assert item['url'] == item['metadata']['source_url'] == 'http://x/sd.mp4'
+    assert 'fallback' not in item
+    assert 'offline' not in item['metadata']
+
+
+def test_dead_fallback_is_not_promoted():
+    checker = _checker({'http://x/hd.mp4': False, 'http://x/sd.mp4': False})
+    try:
+        [(title, item)] = validate_items([('a', _item('http://x/hd.mp4', 'http://x/sd.mp4'))], checker,
+                                         action='flag')
+    finally:
+        checker.pool.shutdown()
+    assert item['url'] == 'http://x/hd.mp4'
+    assert item['metadata']['offline'] is True
@@ -0,0 +1,80 @@
+import os
+import threading
+
+import pytest
+
+from rss_to_strm import fetch
+from rss_to_strm.pipeline import stream_items, write_items
+
+
+def _feed(*titles):
+    items = ''.join(f'<item><title>{title}</title><enclosure url="http://x/{i}.mp4" type="video/mp4"/></item>'
+                    for i, title in enumerate(titles))
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>{items}</channel></rss>'.encode()
+
+
+def _stages():
+    return [t for t in threading.enumerate() if t.name.startswith(('rss-to-strm-fetch', 'rss-to-strm-extract'))]
+
+
+def test_stream_items_in_order():
+    titles = [title for title, item in stream_items('feed', chunks=[_feed('A', 'B', 'C')])]
+    assert titles == ['A', 'B', 'C']
+
+
+def test_stages_stop_when_consumer_stops_early():
+    items = stream_items('feed', chunks=[_feed(*[f'T{i}' for i in range(500)])], queue_size=2)
+    next(items)
+    items.close()
+    assert not _stages()
+
+
+def test_fetch_error_is_raised_and_stages_stop():
+    def chunks():
+        yield _feed('A')[:80]
+        raise OSError('connection reset')
+
+    with pytest.raises(OSError, match='connection reset'):
+        list(stream_items('feed', chunks=chunks()))
+    assert not _stages()
+
+
+def test_failed_split_falls_back_to_whole_document(monkeypatch):
+    body = _feed('A', 'B').replace(b'<title>A</title>', b'<title>A</title><description><![CDATA[</item>]]></description>')
+    monkeypatch.setattr(fetch, '_find_end', lambda buffer, end_tag, position: buffer.find(end_tag, position))
+    assert [title for title, item in stream_items('feed', chunks=[body])] == ['A', 'B']
+
+
+def test_duplicate_titles_keep_last_entry(tmp_path):
+    library = str(tmp_path / 'library')
+    items = stream_items('feed', chunks=[_feed('Show - 1', 'Show - 2', 'Other')])
+    write_items(items, library, download_thumbnails=False)
+
+    assert sorted(os.listdir(library)) == ['.rss-to-strm-manifest.json', 'Other', 'Show']
+    with open(os.path.join(library, 'Show', 'Show.strm')) as f:
+        assert f.read() == 'http://x/1.mp4'
+
+
+def test_failed_nfo_job_fails_the_run(tmp_path, monkeypatch):
+    from rss_to_strm import writer
+
+    def fail(*args, **kwargs):
+        raise OSError('No space left on device')
+
+    monkeypatch.setattr(writer, 'store_thumbnail', lambda *args: None)
+    monkeypatch.setattr(writer, 'write_nfo', fail)
+    body = _feed('A', 'B').replace(b'</title>', b'</title><media:thumbnail url="http://x/t.jpg"/>')
+    body = body.replace(b'<rss version="2.0">', b'<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">')
+
+    with pytest.raises(OSError, match='No space left'):
+        write_items(stream_items('feed', chunks=[body]), str(tmp_path / 'library'))
+
+
+def test_missing_thumbnails_are_counted(tmp_path, monkeypatch):
+    from rss_to_strm import writer
+
+    monkeypatch.setattr(writer, 'store_thumbnail', lambda *args: None)
+    body = _feed('A', 'B').replace(b'</title>', b'</title><media:thumbnail url="http://x/t.jpg"/>')
+    body = body.replace(b'<rss version="2.0">', b'<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">')
+
+    assert write_items(stream_items('feed', chunks=[body]), str(tmp_path / 'library')) == (2, 2)
@@ -0,0 +1,77 @@
+import email.message
+import time
+import urllib.error
+from email.utils import formatdate
+
+import pytest
+
+from rss_to_strm import ratelimit
+from rss_to_strm.ratelimit import HostLimiter, RateController, parse_retry_after
+
+
+def _throttled(code=429, retry_after=None):
+    headers = email.message.Message()
+    if retry_after is not None:
+        headers['Retry-After'] = retry_after
+    return urllib.error.HTTPError('http://cdn.example/t.jpg', code, 'Too Many Requests', headers, None)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('120') == 120
+    assert 50 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_aimd():
+    limiter = HostLimiter('cdn.example', rate=10, concurrency=8)
+    limiter.acquire()
+    limiter.success()
+    assert limiter.rate == 10 + ratelimit.RATE_STEP and limiter.limit > 8
+
+    limiter.acquire()
+    limiter.throttled(0)
+    assert limiter.rate == (10 + ratelimit.RATE_STEP) / 2 and limiter.limit < 8
+
+
+def test_throttled_request_is_retried(monkeypatch):
+    monkeypatch.setattr(ratelimit, 'BACKOFF', 0.01)
+    controller = RateController()
+    responses = [_throttled(), _throttled(retry_after='0'), 'ok']
+
+    def operation():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert controller.call('http://cdn.example/t.jpg', operation) == 'ok'
+    assert controller.summary()['cdn.example']['retried'] == 2
+
+
+def test_long_retry_after_gives_up_without_blocking_the_host():
+    controller = RateController()
+
+    def operation():
+        raise _throttled(retry_after='3600')
+
+    started = time.monotonic()
+    with pytest.raises(urllib.error.HTTPError):
+        controller.call('http://cdn.example/t.jpg', operation)
+    assert time.monotonic() - started < 1
+    limiter = controller.limiter('http://cdn.example/other.jpg')
+    assert limiter.blocked_until - time.monotonic() <= ratelimit.MAX_RETRY_AFTER
+
+
+def test_bare_503_is_not_retried():
+    controller = RateController()
+    calls = []
+
+    def operation():
+        calls.append(1)
+        raise _throttled(code=503)
+
+    with pytest.raises(urllib.error.HTTPError):
+        controller.call('http://cdn.example/t.jpg', operation)
+    assert len(calls) == 1 and not controller.summary()
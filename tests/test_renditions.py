@@ -0,0 +1,64 @@
+import pytest
+
+from rss_to_strm.renditions import _candidate, collect_renditions, rank_renditions, select_rendition
+
+ENTRY = {'media_content': [
+    {'url': 'http://x/show_720p.mp4', 'type': 'video/mp4'},
+    {'url': 'http://x/show_1080p.mp4', 'type': 'video/mp4'},
+    {'url': 'http://x/show_360p.mp4', 'type': 'video/mp4'},
+    {'url': 'http://x/show.m3u8', 'type': 'application/x-mpegURL'},
+]}
+
+
+def _ranked(policy, entry=ENTRY):
+    return [c['url'].rsplit('/', 1)[1] for c in rank_renditions(collect_renditions(entry), policy)]
+
+
+@pytest.mark.parametrize('policy, expected', [
+    ('first', ['show_720p.mp4', 'show_1080p.mp4', 'show_360p.mp4', 'show.m3u8']),
+    ('highest', ['show_1080p.mp4', 'show_720p.mp4', 'show_360p.mp4', 'show.m3u8']),
+    ('lowest', ['show_360p.mp4', 'show_720p.mp4', 'show_1080p.mp4', 'show.m3u8']),
+    ('prefer-hls', ['show.m3u8', 'show_1080p.mp4', 'show_720p.mp4', 'show_360p.mp4']),
+    ('prefer-hd', ['show_1080p.mp4', 'show_720p.mp4', 'show_360p.mp4', 'show.m3u8']),
+    # 720p is estimated at 2332 kbit/s, 1080p at 5248 kbit/s
+    ('max-bitrate=3000', ['show_720p.mp4', 'show_360p.mp4', 'show_1080p.mp4', 'show.m3u8']),
+])
+def test_policies(policy, expected):
+    assert _ranked(policy) == expected
+
+
+def test_max_bitrate_with_nothing_under_the_cap_picks_lowest():
+    assert _ranked('max-bitrate=100')[0] == 'show_360p.mp4'
+
+
+def test_declared_bitrate_beats_url_estimate():
+    entry = {'media_content': [{'url': 'http://x/a_1080p.mp4', 'type': 'video/mp4', 'bitrate': '1000'},
+                               {'url': 'http://x/b_720p.mp4', 'type': 'video/mp4', 'bitrate': '3000'}]}
+    assert _ranked('highest', entry) == ['b_720p.mp4', 'a_1080p.mp4']
+
+
+def test_candidates_without_hints_keep_feed_order():
+    entry = {'enclosures': [{'href': 'http://x/b.mp4', 'type': 'video/mp4'},
+                            {'href': 'http://x/a.mp4', 'type': 'video/mp4'}]}
+    for policy in ('highest', 'lowest', 'prefer-hd', 'max-bitrate=500'):
+        assert _ranked(policy, entry) == ['b.mp4', 'a.mp4'], policy
+    assert select_rendition(entry, 'http://x/b.mp4', 'highest', with_fallback=True)[0] == 'http://x/b.mp4'
+
+
+def test_fallback_is_next_best():
+    url, fallback = select_rendition(ENTRY, 'http://x/show_720p.mp4', 'highest', with_fallback=True)
+    assert url == 'http://x/show_1080p.mp4'
+    assert fallback['url'] == 'http://x/show_720p.mp4'
+
+
+@pytest.mark.parametrize('url, height', [
+    ('http://cdn/a/video_l.mp4', 540),
+    ('http://cdn/a/video.s.mp4', 270),
+    ('http://cdn/a/video_webxl_x.mp4', 720),
+    ('http://cdn/a/video_m.mp4?x=1', 360),
+    ('http://cdn/a_s_b/video.mp4', None),
+    ('http://cdn/m.l/video.mp4', None),
+    ('http://cdn/a/my_s_clip.mp4', None),
+])
+def test_url_markers_only_match_the_file_name(url, height):
+    assert _candidate(url, 'test')['height'] == height
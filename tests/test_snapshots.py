@@ -0,0 +1,41 @@
+import pytest
+
+from rss_to_strm.snapshots import SnapshotStore, resolve_replay
+
+
+def _record(store, body):
+    recorder = store.recorder()
+    list(recorder.wrap([body]))
+    return store.commit(recorder), recorder.digest
+
+
+def test_last_success_is_per_library(tmp_path):
+    store = SnapshotStore(str(tmp_path), 'http://example.com/feed.xml')
+    path, digest = _record(store, b'<rss/>')
+    store.mark_success(path, digest, 'config', str(tmp_path / 'A'))
+
+    assert store.last_success(str(tmp_path / 'A'))['hash'] == digest
+    assert store.last_success(str(tmp_path / 'B')) is None
+
+
+def test_forget_library(tmp_path):
+    store = SnapshotStore(str(tmp_path), 'http://example.com/feed.xml')
+    path, digest = _record(store, b'<rss/>')
+    for library in ('A', 'B'):
+        store.mark_success(path, digest, 'config', str(tmp_path / library))
+
+    store.forget(str(tmp_path / 'A'))
+
+    assert store.last_success(str(tmp_path / 'A')) is None
+    assert store.last_success(str(tmp_path / 'B')) is not None
+
+
+def test_replay_requires_existing_snapshot(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        resolve_replay(str(tmp_path / 'missing.xml'), str(tmp_path), 'http://example.com/feed.xml')
+    with pytest.raises(FileNotFoundError):
+        resolve_replay('latest', str(tmp_path), 'http://example.com/feed.xml')
+
+    store = SnapshotStore(str(tmp_path), 'http://example.com/feed.xml')
+    path, _ = _record(store, b'<rss/>')
+    assert resolve_replay('latest', str(tmp_path), 'http://example.com/feed.xml') == path
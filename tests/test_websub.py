@@ -0,0 +1,72 @@
+import hashlib
+import hmac
+
+from rss_to_strm.websub import Subscriber, verify_signature
+
+
+def test_renewal_uses_granted_lease():
+    subscriber = Subscriber('http://hub.example/', 'http://example.com/feed.xml', 'http://cb.example/websub/x')
+    assert subscriber.needs_renewal()
+
+    subscriber.verified('subscribe', '3600')
+    assert not subscriber.needs_renewal()
+
+    subscriber.lease_expires -= 3600 * 0.9
+    assert subscriber.needs_renewal()
+
+
+def test_signature():
+    body = b'<rss/>'
+    signature = hmac.new(b'secret', body, hashlib.sha256).hexdigest()
+    assert verify_signature('secret', body, f'sha256={signature}')
+    assert not verify_signature('other', body, f'sha256={signature}')
+    assert not verify_signature('secret', body, None)
+
+
+def _callback(subscriber, method='GET', query='', body=b'', headers=None):
+    import http.client
+
+    connection = http.client.HTTPConnection(*subscriber.server.server_address, timeout=5)
+    try:
+        connection.request(method, '/websub/x' + query, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def _started():
+    subscriber = Subscriber('http://hub.example/', 'http://example.com/feed.xml', 'http://cb.example/websub/x',
+                            listen='127.0.0.1:0')
+    subscriber.start()
+    return subscriber
+
+
+def test_denial_requires_matching_topic():
+    subscriber = _started()
+    try:
+        subscriber.pending_mode = 'subscribe'
+        status, _ = _callback(subscriber, query='?hub.mode=denied&hub.topic=http%3A%2F%2Fother%2F')
+        assert status == 404 and not subscriber.answered.is_set()
+
+        status, _ = _callback(subscriber, query='?hub.mode=denied&hub.topic=http%3A%2F%2Fexample.com%2Ffeed.xml')
+        assert status == 200 and subscriber.answered.is_set() and not subscriber.accepted
+    finally:
+        subscriber.server.shutdown()
+
+
+def test_oversized_push_is_refused():
+    from rss_to_strm import websub
+
+    subscriber = _started()
+    try:
+        status, _ = _callback(subscriber, 'POST', headers={'Content-Length': str(websub.MAX_PUSH_SIZE + 1)})
+        assert status == 413
+
+        body = b'<rss/>'
+        signature = hmac.new(subscriber.secret.encode(), body, hashlib.sha256).hexdigest()
+        status, _ = _callback(subscriber, 'POST', body=body, headers={'X-Hub-Signature': f'sha256={signature}'})
+        assert status == 202
+        assert subscriber.pushes.get_nowait() == body
+    finally:
+        subscriber.server.shutdown()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test Helper: Minimaler lokaler WebSub-Hub zum Testen des Push-Modus
+
+Der Hub nimmt Subscriptions an (inkl. Intent-Verification per hub.challenge)
+und verteilt bei "publish" den aktuellen Inhalt des Topics signiert
+(X-Hub-Signature: sha256=...) an alle Subscriber.
+
+Beispiel:
+    # 1. Feed mit <atom:link rel="hub" href="http://127.0.0.1:8090/"/> und
+    #    <atom:link rel="self" href="http://127.0.0.1:8000/feed.xml"/> bereitstellen
+    python3 -m http.server 8000 &
+
+    # 2. Hub starten
+    python3 websub_demo_hub.py --port 8090 &
+
+    # 3. Konverter im Push-Modus starten
+    python3 rss-to-strm.py http://127.0.0.1:8000/feed.xml ./output "" --websub --websub-listen 127.0.0.1:8085
+
+    # 4. Feed ändern und Update veröffentlichen
+    curl -d hub.mode=publish -d hub.url=http://127.0.0.1:8000/feed.xml http://127.0.0.1:8090/
+"""
+
+import argparse
+import hashlib
+import hmac
+import secrets
+import threading
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+subscriptions = {}  # topic -> {callback: secret}
+lock = threading.Lock()
+
+
+def verify_intent(mode, topic, callback, secret, lease):
+    """GET auf den Callback mit hub.challenge; Subscription gilt nur bei Echo"""
+    challenge = secrets.token_hex(16)
+    query = urllib.parse.urlencode({'hub.mode': mode, 'hub.topic': topic,
+                                    'hub.challenge': challenge, 'hub.lease_seconds': lease})
+    separator = '&' if '?' in callback else '?'
+    try:
+        with urllib.request.urlopen(callback + separator + query, timeout=10) as response:
+            echoed = response.read().decode('utf-8')
+    except Exception as e:
+        print(f"✗ Verification fehlgeschlagen ({callback}): {e}")
+        return
+    if echoed != challenge:
+        print(f"✗ Falsches Challenge-Echo von {callback}")
+        return
+    with lock:
+        if mode == 'subscribe':
+            subscriptions.setdefault(topic, {})[callback] = secret
+        else:
+            subscriptions.get(topic, {}).pop(callback, None)
+    print(f"✓ {mode}: {callback} → {topic}")
+
+
+def distribute(topic):
+    """Topic laden und signiert an alle Subscriber schicken"""
+    with urllib.request.urlopen(topic, timeout=10) as response:
+        body = response.read()
+        content_type = response.headers.get('Content-Type', 'application/rss+xml')
+    with lock:
+        targets = dict(subscriptions.get(topic, {}))
+    for callback, secret in targets.items():
+        request = urllib.request.Request(callback, data=body, method='POST', headers={
+            'Content-Type': content_type,
+            'Link': f'<http://{HUB_ADDRESS}/>; rel="hub", <{topic}>; rel="self"',
+        })
+        if secret:
+            signature = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+            request.add_header('X-Hub-Signature', f'sha256={signature}')
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                print(f"→ Push an {callback}: HTTP {response.status} ({len(body)} Bytes)")
+        except Exception as e:
+            print(f"✗ Push an {callback} fehlgeschlagen: {e}")
+
+
+class HubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        params = {k: v[0] for k, v in urllib.parse.parse_qs(self.rfile.read(length).decode('utf-8')).items()}
+        mode = params.get('hub.mode')
+
+        if mode in ('subscribe', 'unsubscribe') and params.get('hub.topic') and params.get('hub.callback'):
+            self.send_response(202)
+            self.end_headers()
+            threading.Thread(target=verify_intent, args=(
+                mode, params['hub.topic'], params['hub.callback'],
+                params.get('hub.secret'), params.get('hub.lease_seconds', '86400'))).start()
+        elif mode == 'publish' and params.get('hub.url'):
+            self.send_response(204)
+            self.end_headers()
+            threading.Thread(target=distribute, args=(params['hub.url'],)).start()
+        else:
+            self.send_response(400)
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lokaler WebSub-Test-Hub")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    args = parser.parse_args()
+
+    HUB_ADDRESS = f"{args.host}:{args.port}"
+    print(f"🛰️  WebSub-Test-Hub läuft auf http://{HUB_ADDRESS}/")
+    ThreadingHTTPServer((args.host, args.port), HubHandler).serve_forever()